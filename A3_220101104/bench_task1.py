@@ -0,0 +1,247 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from task1 import _enumerate, iter_stack_permutations, parallel_stack_permutations, stack_permutations, write_permutations
+
+
+def legacy_stack_permutations(remaining_input):
+    """
+    Reference copy of the original recursive generator, kept for comparison.
+
+    Args:
+    - remaining_input (list): Elements in injection order.
+
+    Returns:
+    - list: List of stack-realizable permutations.
+    """
+
+    def generate_permutations(stack, current_permutation, remaining_input):
+        if not stack and not remaining_input:
+            permutations.append(current_permutation[:])
+            return
+
+        if stack:
+            top_element = stack.pop()
+            generate_permutations(stack, current_permutation + [top_element], remaining_input)
+            stack.append(top_element)
+
+        if remaining_input:
+            element = remaining_input.pop(0)
+            stack.append(element)
+            generate_permutations(stack, current_permutation, remaining_input)
+            stack.pop()
+            remaining_input.insert(0, element)
+
+    permutations = []
+    generate_permutations([], [], list(remaining_input))
+    return permutations
+
+
+def _parallel_shards(values, output):
+    return sum(len(shard) for shard in parallel_stack_permutations(len(values), output=output)) // (
+        len(values) if output == "bytes" else 1)
+
+
+def _write_binary(values):
+    with open(os.devnull, "wb") as sink:
+        return write_permutations(_enumerate(values), len(values), sink)
+
+
+# Each engine returns either the number of permutations it produced or the
+# list it built, paired with the largest n it is run for by default.
+# "iterative" yields one shared buffer and "binary"/"parallel-*" pack rows,
+# so only the engines in COPYING hand out lists as the recursive one does.
+ENGINES = {
+    "iterative": (lambda values: sum(1 for _ in _enumerate(values)), 16),
+    "generator": (lambda values: sum(1 for _ in iter_stack_permutations(values)), 16),
+    "parallel": (lambda values: sum(1 for _ in parallel_stack_permutations(len(values))), 16),
+    "parallel-bytes": (lambda values: _parallel_shards(values, "bytes"), 16),
+    "parallel-numpy": (lambda values: _parallel_shards(values, "numpy"), 16),
+    "binary": (_write_binary, 16),
+    "list": (stack_permutations, 14),
+    "recursive": (legacy_stack_permutations, 14),
+}
+
+
+COPYING = ("generator", "list", "parallel")
+
+
+def compare_with_recursive(results):
+    """
+    Speedup of each copying engine over the recursive generator at every n both ran.
+
+    Returns:
+    - list: (engine, n, speedup) tuples.
+    """
+    recursive = {r["n"]: r["seconds"] for r in results if r["engine"] == "recursive"}
+    return [(r["engine"], r["n"], recursive[r["n"]] / r["seconds"])
+            for r in results if r["engine"] in COPYING and r["n"] in recursive]
+
+
+def _peak_rss_kb():
+    """
+    Peak resident memory of this process and its finished children, in KiB.
+
+    Linux carries ru_maxrss over from the parent process, so VmHWM from
+    /proc is preferred for this process where it exists.
+    """
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return max(int(line.split()[1]), children)
+    except OSError:
+        pass
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, children)
+
+
+def run_case(engine, n, trace=True):
+    """
+    Run one engine for input 1..n and measure it.
+
+    Meant to run in a fresh process, so the peak RSS belongs to this case alone
+    (or to its largest worker, for the parallel engine). The timed run is
+    followed, when `trace` is set, by a second run under tracemalloc, which
+    slows allocation down too much to share a run with the timing.
+
+    Args:
+    - engine (str): Key into ENGINES.
+    - n (int): Input length.
+    - trace (bool): Whether to make the traced run.
+
+    Returns:
+    - dict: Throughput, peak RSS and traced peak memory for the run. The
+      ceiling is permutations per second of this process's own CPU time: the
+      most a parallel engine can deliver however many workers it has. The
+      traced peak is the most Python memory this process held at once,
+      above what it held before the run, per permutation; None without a
+      traced run.
+    """
+    run, _ = ENGINES[engine]
+    values = list(range(1, n + 1))
+
+    begin, cpu = time.perf_counter(), time.process_time()
+    result = run(values)
+    seconds = time.perf_counter() - begin
+    cpu = time.process_time() - cpu                                                                         # This process only, not its workers
+    count = result if isinstance(result, int) else len(result)
+    del result
+    peak_rss_kb = _peak_rss_kb()
+
+    traced = None
+    if trace:
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            run(values)                                                                                     # The peak is kept after the result is freed
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        traced = (peak - baseline) / count
+
+    return {
+        "engine": engine,
+        "n": n,
+        "count": count,
+        "seconds": seconds,
+        "perms_per_sec": count / seconds if seconds else float("inf"),
+        "ceiling_per_sec": count / cpu if cpu else float("inf"),
+        "peak_rss_kb": peak_rss_kb,
+        "traced_peak_bytes_per_perm": traced,
+    }
+
+
+def run_suite(engines, sizes, trace_max=13):
+    """
+    Run every engine for every size, each case in its own spawned process.
+
+    Cases above `trace_max` skip the traced run.
+
+    Returns:
+    - list: One result dict per case.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for engine in engines:
+        for n in sizes:
+            if n > ENGINES[engine][1]:
+                continue
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                result = executor.submit(run_case, engine, n, n <= trace_max).result()
+            traced = result["traced_peak_bytes_per_perm"]
+            print(f"{engine:>14} n={n:<3} {result['count']:>10} perms {result['seconds']:>8.3f}s "
+                  f"{result['perms_per_sec']:>12,.0f}/s (ceiling {result['ceiling_per_sec']:>14,.0f}/s) "
+                  f"{result['peak_rss_kb'] / 1024:>8.1f} MiB "
+                  + (f"{traced:>9.2f} traced peak bytes/perm" if traced is not None else f"{'-':>9} traced peak bytes/perm"),
+                  flush=True)
+            results.append(result)
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare throughput with a stored baseline.
+
+    Args:
+    - results (list): Result dicts from run_suite.
+    - baseline (list): Result dicts from an earlier run.
+    - threshold (float): Allowed slowdown in percent.
+
+    Returns:
+    - list: A message for every case slower than the baseline by more than `threshold`.
+    """
+    previous = {(r["engine"], r["n"]): r["perms_per_sec"] for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["engine"], result["n"]))
+        if before and result["perms_per_sec"] < before * (1 - threshold / 100):
+            drop = 100 * (1 - result["perms_per_sec"] / before)
+            regressions.append(f"{result['engine']} n={result['n']}: {drop:.1f}% slower than baseline")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the stack permutation engines.")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(range(8, 17)), help="input lengths (default: 8..16)")
+    parser.add_argument("-e", "--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES), help="engines to run (default: all)")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="JSON results to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=10.0, help="allowed throughput drop in percent (default: 10)")
+    parser.add_argument("--trace-max", type=int, default=13, help="largest n also run under tracemalloc (default: 13)")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args()
+
+    # Results must match exactly before timings mean anything
+    values = list(range(1, 9))
+    if legacy_stack_permutations(values) != [p[:] for p in _enumerate(values)]:
+        sys.exit("Error: iterative engine disagrees with the recursive generator")
+
+    results = run_suite(args.engines, args.sizes, args.trace_max)
+    for engine, n, speedup in compare_with_recursive(results):
+        print(f"{engine} n={n}: {speedup:.1f}x the recursive generator")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline:
+        if args.update_baseline or not os.path.exists(args.baseline):
+            with open(args.baseline, "w") as handle:
+                json.dump(results, handle, indent=2)
+            print(f"Baseline written to {args.baseline}")
+        else:
+            with open(args.baseline) as handle:
+                regressions = find_regressions(results, json.load(handle), args.threshold)
+            for message in regressions:
+                print(f"REGRESSION: {message}")
+            if regressions:
+                sys.exit(1)
+            print(f"No regressions beyond {args.threshold}% against {args.baseline}")
@@ -0,0 +1,344 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+
+class ContainerModel(ABC):
+    """
+    A sorting network: the containers an input stream passes through on its way to the output.
+
+    The engine works on canonical configurations. The elements still to be
+    output are labelled 0..k-1 by rank, containers hold some of these labels
+    and the remaining input is always the r largest labels in order. Two
+    configurations with the same canonical form have the same futures, so
+    counts are memoized on sets of them and shared between all n.
+
+    Subclasses must implement `initial`, `pushes` and `pops`, and may
+    override `transfers` and `normalize`. Container states are tuples of
+    tuples.
+
+    Models whose number of configurations grows exponentially set `max_n`
+    to the largest n they count in a few seconds, and larger n raise a
+    ValueError. Setting `max_n` to None on an instance lifts the limit.
+    """
+
+    name = "container"
+    max_n = None                                                                                            # Largest n accepted, None for no limit
+
+    def __init__(self):
+        self._counts = {}
+        self._successors = lru_cache(maxsize=1 << 16)(self._successors)
+
+    @abstractmethod
+    def initial(self):
+        """
+        Return the empty container state.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def pushes(self, state, element):
+        """
+        Yield every state reached by moving `element` from the input into the containers.
+        """
+        raise NotImplementedError
+
+    def transfers(self, state):
+        """
+        Yield every state reached by one internal move between containers.
+        """
+        return ()
+
+    @abstractmethod
+    def pops(self, state):
+        """
+        Yield (element, state) for every way of moving an element to the output.
+        """
+        raise NotImplementedError
+
+    def normalize(self, state):
+        """
+        Map equivalent container states onto one representative.
+        """
+        return state
+
+    def _closure(self, states):
+        """
+        Close a set of states under internal moves.
+        """
+        seen = set(states)
+        frontier = list(seen)
+        while frontier:
+            for moved in self.transfers(frontier.pop()):
+                moved = self.normalize(moved)
+                if moved not in seen:
+                    seen.add(moved)
+                    frontier.append(moved)
+        return seen
+
+    def _successors(self, configs):
+        """
+        Group the configurations reachable by one output step by the element output.
+
+        Inputs are only pushed when the element to output has not been pushed
+        yet, and then only up to that element: pushing earlier can always be
+        postponed, since extra elements never make a buried element reachable.
+
+        Args:
+        - configs (frozenset): Canonical (state, remaining input) configurations.
+
+        Returns:
+        - tuple: Sorted (element, frozenset of canonical configurations) pairs.
+        """
+        successors = {}
+        for state, remaining in configs:
+            total = remaining + sum(map(len, state))
+            states = self._closure((state,))
+
+            for element, popped in self._pops_from(states):
+                successors.setdefault(element, set()).add((self._relabel(popped, element), remaining))
+
+            # Push the input up to and including each candidate, then output it.
+            for pushed in range(remaining):
+                element = total - remaining + pushed
+                states = self._closure({self.normalize(s) for old in states for s in self.pushes(old, element)})
+                for output, popped in self._pops_from(states):
+                    if output == element:
+                        successors.setdefault(element, set()).add((self._relabel(popped, element), remaining - pushed - 1))
+
+        return tuple(sorted((element, frozenset(group)) for element, group in successors.items()))
+
+    def _pops_from(self, states):
+        for state in states:
+            for element, popped in self.pops(state):
+                yield element, popped
+
+    def _relabel(self, state, element):
+        """
+        Drop `element` from the canonical labels after it has been output.
+        """
+        return self.normalize(tuple(tuple(v - (v > element) for v in container) for container in state))
+
+    def _check_size(self, n):
+        if n < 0:
+            raise ValueError("Error: The number of elements should not be negative.")
+        if self.max_n is not None and n > self.max_n:
+            raise ValueError(f"Error: {self!r} only handles up to {self.max_n} elements in reasonable time; "
+                             "set max_n to None to try anyway.")
+
+    def _count(self, configs):
+        state, remaining = next(iter(configs))
+        if not remaining and not any(state):
+            return 1                                                                                        # Everything has been output
+        if configs not in self._counts:
+            self._counts[configs] = sum(self._count(group) for _, group in self._successors(configs))
+        return self._counts[configs]
+
+    def count(self, n):
+        """
+        Count the distinct permutations of n elements this network can produce.
+
+        Args:
+        - n (int): Number of elements.
+
+        Returns:
+        - int: Exact number of realizable permutations.
+
+        Raises:
+        - ValueError: If n is negative or above `max_n`.
+        """
+        self._check_size(n)
+        return self._count(frozenset({(self.initial(), n)}))
+
+    def permutations(self, n):
+        """
+        Generate the distinct permutations of 1..n this network can produce.
+
+        Permutations are yielded in lexicographic order, each exactly once,
+        however many operation sequences produce it.
+
+        Args:
+        - n (int): Number of elements.
+
+        Yields:
+        - list: The next realizable permutation.
+
+        Raises:
+        - ValueError: If n is negative or above `max_n`.
+        """
+        self._check_size(n)
+        remaining = list(range(1, n + 1))
+        output = []
+
+        def generate(configs):
+            if not remaining:
+                yield output[:]
+                return
+            for element, group in self._successors(configs):
+                value = remaining.pop(element)
+                output.append(value)
+                yield from generate(group)
+                output.pop()
+                remaining.insert(element, value)
+
+        yield from generate(frozenset({(self.initial(), n)}))
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class Stack(ContainerModel):
+    """
+    A single stack: the model behind stack_permutations.
+    """
+
+    name = "stack"
+
+    def initial(self):
+        return ((),)
+
+    def pushes(self, state, element):
+        yield (state[0] + (element,),)
+
+    def pops(self, state):
+        if state[0]:
+            yield state[0][-1], (state[0][:-1],)
+
+
+class OutputRestrictedDeque(ContainerModel):
+    """
+    A deque that accepts elements at both ends but only outputs from one.
+    """
+
+    name = "output-restricted deque"
+
+    def initial(self):
+        return ((),)
+
+    def count(self, n):
+        """
+        Count through the input-restricted deque, whose permutations match
+        these one-to-one under inversion and reversal (Knuth, TAOCP 2.2.1).
+        Pushing at both ends makes the direct search branch far more than
+        popping at both.
+        """
+        return InputRestrictedDeque().count(n)
+
+    def pushes(self, state, element):
+        deque = state[0]
+        yield (deque + (element,),)
+        if deque:
+            yield ((element,) + deque,)                                                                     # Both ends coincide while empty
+
+    def pops(self, state):
+        if state[0]:
+            yield state[0][-1], (state[0][:-1],)
+
+
+class InputRestrictedDeque(ContainerModel):
+    """
+    A deque that accepts elements at one end but outputs from both.
+    """
+
+    name = "input-restricted deque"
+
+    def initial(self):
+        return ((),)
+
+    def pushes(self, state, element):
+        yield (state[0] + (element,),)
+
+    def pops(self, state):
+        deque = state[0]
+        if deque:
+            yield deque[-1], (deque[:-1],)
+            if len(deque) > 1:
+                yield deque[0], (deque[1:],)
+
+
+class ParallelStacks(ContainerModel):
+    """
+    k stacks side by side: each element is pushed onto any stack and output from any top.
+    """
+
+    name = "parallel stacks"
+    FEASIBLE_N = {1: None, 2: 14, 3: 11, 4: 10}                                                             # Largest n counted in under 10 s, by k
+
+    def __init__(self, k=2):
+        if k < 1:
+            raise ValueError("Error: At least one stack is needed.")
+        self.k = k
+        self.max_n = self.FEASIBLE_N.get(k, 9)
+        super().__init__()
+
+    def initial(self):
+        return ((),) * self.k
+
+    def pushes(self, state, element):
+        for i, stack in enumerate(state):
+            if stack or i == state.index(()):                                                               # All empty stacks are interchangeable
+                yield state[:i] + (stack + (element,),) + state[i + 1:]
+
+    def pops(self, state):
+        for i, stack in enumerate(state):
+            if stack:
+                yield stack[-1], state[:i] + (stack[:-1],) + state[i + 1:]
+
+    def normalize(self, state):
+        return tuple(sorted(state))                                                                         # The stacks are indistinguishable
+
+    def __repr__(self):
+        return f"{type(self).__name__}(k={self.k})"
+
+
+class SeriesStacks(ContainerModel):
+    """
+    k stacks in a row: input enters the first, tops move one stack along, and the last feeds the output.
+    """
+
+    name = "series stacks"
+    FEASIBLE_N = {1: None, 2: 10, 3: 7, 4: 6}                                                               # Largest n counted in under 10 s, by k
+
+    def __init__(self, k=2):
+        if k < 1:
+            raise ValueError("Error: At least one stack is needed.")
+        self.k = k
+        self.max_n = self.FEASIBLE_N.get(k, 5)
+        super().__init__()
+
+    def initial(self):
+        return ((),) * self.k
+
+    def pushes(self, state, element):
+        yield (state[0] + (element,),) + state[1:]
+
+    def transfers(self, state):
+        for i in range(self.k - 1):
+            if state[i]:
+                yield state[:i] + (state[i][:-1], state[i + 1] + (state[i][-1],)) + state[i + 2:]
+
+    def pops(self, state):
+        if state[-1]:
+            yield state[-1][-1], state[:-1] + (state[-1][:-1],)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(k={self.k})"
+
+
+MODELS = {
+    "stack": Stack,
+    "output-restricted-deque": OutputRestrictedDeque,
+    "input-restricted-deque": InputRestrictedDeque,
+    "parallel-stacks": ParallelStacks,
+    "series-stacks": SeriesStacks,
+}
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for model in (Stack(), OutputRestrictedDeque(), InputRestrictedDeque(), ParallelStacks(2), SeriesStacks(2)):
+        begin = time.perf_counter()
+        counts = [model.count(size) for size in range(1, min(n, model.max_n or n) + 1)]
+        print(f"{model!r:<24} {time.perf_counter() - begin:8.2f}s  {counts}")
@@ -1,97 +1,1030 @@
-import sys
-
-def stack_permutations(input_list):
-    """
-    Generate stack-realizable permutations from the given input list.
-
-    Args:
-    - input_list (list or str): List of distinct integers or a comma-separated string.
-
-    Returns:
-    - list: List of stack-realizable permutations.
-    """
-    
-    def has_repeats(lst):
-        return len(lst) != len(set(lst))                                                                    # checks for repeats using non-repeating property of sets
-
-    def follows_sequence(lst):
-        return lst == list(range(1, len(lst) + 1))                                                          # creates a list of ordered elements up to the length of input and compares with input
-
-    def generate_permutations(stack, current_permutation, remaining_input):
-        """
-        Recursively generate stack-realizable permutations.
-
-        Args:
-        - stack (list): Stack of elements.
-        - current_permutation (list): Current permutation in progress.
-        - remaining_input (list): Remaining elements to be injected.
-
-        Returns:
-        - None
-        """
-        # Base case: If both the stack and input are empty, a valid permutation is discovered.
-        if not stack and not remaining_input:
-            permutations.append(current_permutation[:])                                                     # Insert input to the list of valid permutations
-            return
-
-        # Try extracting from the stack if not empty to generate a new sequence of stack realisable permuutations
-        if stack:
-            top_element = stack.pop()                                                                       # Extraction step from stack
-            generate_permutations(stack, current_permutation + [top_element], remaining_input)              # Recurse on the current state of lists and stacks after adding top element to the current permutation list
-            stack.append(top_element)                                                                       # Restore the stack to its previous state.
-
-        # Try injecting from the input if not empty to generate another sequence of permutations
-        if remaining_input:
-            element = remaining_input.pop(0)                                                                # Extract top element from input list
-            stack.append(element)                                                                           # Add element to the temporary stack
-            generate_permutations(stack, current_permutation, remaining_input)                              # Recurse on the current state of lists and stacks
-            stack.pop()                                                                                     # Restore the stack to its previous state.
-            remaining_input.insert(0, element)                                                              # Restore the input to its previous state.
-
-    # Input validation
-    if isinstance(input_list, str):
-        remaining_input = input_list.split(',')                                                             # If the input is a string, split it into a list
-    else:
-        remaining_input = input_list                                                                        # Otherwise, it's already a list
-
-    try:
-        remaining_input = [int(num) for num in remaining_input]                                             # Try to convert the elements to integers
-    except ValueError:
-        return "Error: Input contains non-integer values."
-
-    # Check for repeats
-    if has_repeats(remaining_input):
-        return "Error: The input should not contain repeating values."                                      # Error message for repeated numbers in inputs
-
-    # Check if input follows sequence
-    if not follows_sequence(remaining_input):
-        return "Error: The input should follow the sequence of natural numbers."                            # Error message for not following the sequence
-
-    # Initialize variables
-    stack = []
-    permutations = []
-
-    # Initiate the permutation generation process.
-    generate_permutations(stack, [], remaining_input)
-
-    return permutations
-
-
-if __name__ == "__main__":
-    input_string = input("Enter a comma-separated list of numbers: ")                                       # Input from the user: a comma-separated list of numbers
-
-    result = stack_permutations(input_string)                                                               # Desired list of permutations
-
-    if isinstance(result, str):
-        print(f"Error: {result}")
-        sys.exit()
-
-    permutations = result
-    count = len(permutations)
-
-    # Display the numbered stack-realizable permutations and the total count
-    print(f"Stack-realizable permutations for input: {input_string}")
-    for i, p in enumerate(permutations, 1):
-        print(f"{i}. {p}")
-
-    print(f"Total number of stack-realizable permutations: {count}")
+import argparse
+import os
+import random
+import struct
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import chain, islice
+from math import comb
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:                                                                                         # NumPy is only needed for the batch helpers
+    np = None
+
+
+def _count_completions(height, remaining):
+    """
+    Count the ways to finish a push/pop run from a given state.
+
+    Args:
+    - height (int): Number of elements currently on the stack.
+    - remaining (int): Number of elements still to be injected.
+
+    Returns:
+    - int: Number of distinct permutations reachable from this state (a ballot number).
+    """
+    return (height + 1) * comb(2 * remaining + height, remaining) // (remaining + height + 1)
+
+
+def _split_commas(text):
+    """
+    Yield the comma-separated fields of `text` one at a time, without building a list.
+    """
+    begin = 0
+    while (end := text.find(',', begin)) >= 0:
+        yield text[begin:end]
+        begin = end + 1
+    yield text[begin:]
+
+
+def _as_label(token):
+    """
+    Turn a text field into a label: an integer if it reads as one, otherwise the stripped text.
+    """
+    token = token.strip()
+    if not token:
+        raise ValueError("Error: Input contains empty values.")
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def _iter_labels(input_list):
+    """
+    Stream the labels of an input, checking for repeats in the same pass.
+
+    Args:
+    - input_list (iterable or str): Distinct labels (integers, strings, ...) or a comma-separated string.
+
+    Yields:
+    - The labels in injection order. Fields of a comma-separated string that
+      read as integers become integers; elements of any other iterable are
+      used unchanged.
+
+    Raises:
+    - ValueError: If a field of a string is empty, or a label is repeated.
+    """
+    seen = set()
+    labels = map(_as_label, _split_commas(input_list)) if isinstance(input_list, str) else input_list
+    for label in labels:
+        if label in seen:                                                                                   # checks for repeats using non-repeating property of sets
+            raise ValueError("Error: The input should not contain repeating values.")                       # Error message for repeated labels in inputs
+        seen.add(label)
+        yield label
+
+
+class _LabelMap:
+    """
+    Maps distinct labels onto 1..n in injection order and back.
+
+    The counting, ranking and sampling code works on 1..n only; this layer
+    lets callers use any hashable labels instead.
+    """
+
+    __slots__ = ('labels', 'index')
+
+    def __init__(self, input_list):
+        self.labels = list(_iter_labels(input_list))
+        self.index = {label: i for i, label in enumerate(self.labels, 1)}
+
+    def encode(self, sequence):
+        """
+        Translate labels to 1..n, sending unknown labels to 0.
+        """
+        return [self.index.get(label, 0) for label in sequence]
+
+    def decode(self, perm):
+        """
+        Translate a permutation of 1..n back to labels.
+        """
+        return [self.labels[i - 1] for i in perm]
+
+
+def _resolve(n):
+    """
+    Accept either an element count or a labelled input.
+
+    Returns:
+    - tuple: (n, _LabelMap or None)
+    """
+    if isinstance(n, int):
+        return n, None
+    labels = _LabelMap(n)
+    return len(labels.labels), labels
+
+
+def iter_stack_permutations(input_list, start=0, limit=None):
+    """
+    Lazily generate stack-realizable permutations from the given input list.
+
+    Permutations are yielded one at a time in the same order as
+    stack_permutations, so memory use stays proportional to the input length.
+    Whole subtrees of the search that fall before `start` are skipped by
+    counting them, so paging never enumerates the prefix.
+
+    Args:
+    - input_list (list or str): Distinct labels in injection order, or a comma-separated string of them.
+    - start (int): Index of the first permutation to yield. Defaults to 0.
+    - limit (int or None): Maximum number of permutations to yield. Defaults to no limit.
+
+    Yields:
+    - list: The next stack-realizable permutation of the labels.
+
+    Raises:
+    - ValueError: If a label is empty or repeated, or `start`/`limit` is negative.
+    """
+    remaining_input = list(_iter_labels(input_list))
+    if start < 0 or (limit is not None and limit < 0):
+        raise ValueError("Error: start and limit must be non-negative.")
+
+    permutations = _enumerate(remaining_input, start, copy=True)                                            # A new list per permutation for the caller
+    if limit is not None:
+        permutations = islice(permutations, limit)
+    return permutations
+
+
+_TAIL = 9                                                                                                   # Outputs left when the loop hands over to precomputed tails
+
+
+@lru_cache(maxsize=None)
+def _tails(height, remaining):
+    """
+    Precompute every way to finish from a state as index lookups into a pool.
+
+    The pool holds the stack contents from top to bottom followed by the
+    remaining input, so a state with `height` and `remaining` elements maps
+    onto the same tails whatever the actual values are.
+
+    Args:
+    - height (int): Number of elements currently on the stack.
+    - remaining (int): Number of elements still to be injected.
+
+    Returns:
+    - tuple: One tuple of pool indices per tail, in enumeration order.
+    """
+    tails = []
+    stack = list(range(height - 1, -1, -1))                                                                 # Pool index 0 is the top of the stack
+    tail = []
+
+    def finish(next_index):
+        if not stack and next_index == height + remaining:
+            tails.append(tuple(tail))
+            return
+        if stack:
+            top_element = stack.pop()
+            tail.append(top_element)
+            finish(next_index)
+            tail.pop()
+            stack.append(top_element)
+        if next_index < height + remaining:
+            stack.append(next_index)
+            finish(next_index + 1)
+            stack.pop()
+
+    finish(height)
+    return tuple(tails)
+
+
+@lru_cache(maxsize=None)
+def _tail_getters(height, remaining):
+    """
+    The tails of a state as getters, each mapping the pool to a tuple.
+    """
+    return tuple(itemgetter(*t) if len(t) > 1 else tuple for t in _tails(height, remaining))                # A 0/1 element tail is the pool itself
+
+
+@lru_cache(maxsize=None)
+def _tail_rows(height, remaining, emitted):
+    """
+    The tails of a state as whole rows of byte indices, for bytes.translate.
+
+    Index i < emitted stands for output i; the rest index the pool, shifted by
+    `emitted`. Translating through the outputs followed by the pool gives
+    every row of the batch at once.
+    """
+    prefix = bytes(range(emitted))
+    return b"".join(prefix + bytes(emitted + i for i in tail) for tail in _tails(height, remaining))
+
+
+def _enumerate(values, start=0, packed=False, copy=False):
+    """
+    Iteratively enumerate stack-realizable permutations of `values`.
+
+    The search runs as an explicit loop over a record of push/pop decisions,
+    so it never recurses and never copies partial results. The input is
+    consumed through an index pointer and the output is written into one
+    preallocated buffer, which is yielded in place and overwritten on the
+    next step: callers that keep a permutation must copy it. The last
+    `_TAIL` outputs of each permutation come from precomputed tails, so the
+    loop only walks the upper part of the search tree.
+
+    Args:
+    - values (list): Elements in injection order.
+    - start (int): Index of the first permutation to yield.
+    - packed (bool): Yield bytes holding a whole batch of permutations, n bytes
+      each, instead of the shared buffer once per permutation. Values must lie in 0..255.
+    - copy (bool): Yield a new list per permutation, built in one step from the
+      shared prefix and its tail, instead of the shared buffer.
+
+    Yields:
+    - list: The shared output buffer, or with `copy` a new list, holding the next permutation.
+    - bytes: With `packed`, the next batch of permutations as packed rows.
+    """
+    n = len(values)
+    if start >= _count_completions(0, n):
+        return
+
+    cutoff = max(n - _TAIL, 0)                                                                              # Number of outputs produced by the loop itself
+    stack = [None] * n
+    out = [None] * n
+    actions = bytearray(2 * n)                                                                              # 0 = pop, 1 = push at each depth
+    height = next_index = emitted = depth = 0
+
+    # Descend straight to the `start`-th permutation, skipping whole subtrees by their counts.
+    skip = start
+    while emitted < cutoff:
+        if height and (skip < (subtree := _count_completions(height - 1, n - next_index)) or next_index == n):
+            height -= 1
+            out[emitted] = stack[height]
+            emitted += 1
+            actions[depth] = 0
+        else:
+            if height:
+                skip -= subtree
+            stack[height] = values[next_index]
+            height += 1
+            next_index += 1
+            actions[depth] = 1
+        depth += 1
+    getters = _tail_getters(height, n - next_index)[skip:]
+    skipped = skip * n                                                                                      # Bytes of the first packed batch to drop
+
+    while True:
+        pool = (*stack[height - 1::-1], *values[next_index:]) if height else tuple(values[next_index:])
+        if packed:
+            table = bytes(out[:emitted]) + bytes(pool)
+            yield _tail_rows(height, n - next_index, emitted)[skipped:].translate(table + bytes(256 - n))
+            skipped = 0
+        elif copy:
+            prefix = out[:emitted]
+            for getter in getters:
+                yield [*prefix, *getter(pool)]
+        else:
+            for getter in getters:
+                out[emitted:] = getter(pool)
+                yield out
+
+        # Backtrack to the deepest pop that could have been a push instead.
+        while True:
+            if not depth:
+                return
+            depth -= 1
+            if actions[depth]:
+                height -= 1                                                                                 # Undo a push
+                next_index -= 1
+            else:
+                emitted -= 1                                                                                # Undo a pop
+                stack[height] = out[emitted]
+                height += 1
+                if next_index < n:
+                    break
+
+        # Take the push branch, then follow pop-first choices down to the next batch of tails.
+        stack[height] = values[next_index]
+        height += 1
+        next_index += 1
+        actions[depth] = 1
+        depth += 1
+        while emitted < cutoff:
+            if height:
+                height -= 1
+                out[emitted] = stack[height]
+                emitted += 1
+                actions[depth] = 0
+            else:
+                stack[height] = values[next_index]
+                height += 1
+                next_index += 1
+                actions[depth] = 1
+            depth += 1
+        getters = _tail_getters(height, n - next_index)
+
+
+def count_stack_permutations(n):
+    """
+    Count the stack-realizable permutations of n elements without enumerating them.
+
+    Args:
+    - n (int, iterable or str): Number of elements, or the labels themselves. Labels
+      are streamed and checked for repeats without being copied into a list.
+
+    Returns:
+    - int: The n-th Catalan number, as an exact integer.
+
+    Raises:
+    - ValueError: If n is negative or a label is empty or repeated.
+    """
+    if not isinstance(n, int):
+        n = sum(1 for _ in _iter_labels(n))
+    if n < 0:
+        raise ValueError("Error: The number of elements should not be negative.")
+    return _count_completions(0, n)
+
+
+def rank(perm, labels=None):
+    """
+    Find the position of a permutation in the enumeration order.
+
+    Replays the unique push/pop run that produces `perm` from 1..n and, for
+    every push taken where a pop was also possible, adds the size of the
+    skipped pop subtree.
+
+    Args:
+    - perm (list): A stack-realizable permutation of 1..n, or of `labels`.
+    - labels (iterable or str or None): Input labels in injection order. Defaults to 1..n.
+
+    Returns:
+    - int: Zero-based index of `perm` in iter_stack_permutations(labels).
+
+    Raises:
+    - ValueError: If `perm` is not a stack-realizable permutation of the input.
+    """
+    if labels is not None:
+        perm = _LabelMap(labels).encode(perm)
+    n = len(perm)
+    if sorted(perm) != list(range(1, n + 1)):
+        raise ValueError("Error: The input should be a permutation of natural numbers.")
+
+    position = 0
+    stack = []
+    next_input = 1
+    for element in perm:
+        while not stack or stack[-1] != element:
+            if next_input > element:
+                raise ValueError("Error: The permutation is not stack-realizable.")                         # The element is buried in the stack
+            if stack:
+                position += _count_completions(len(stack) - 1, n - next_input + 1)                          # Skip the pop-first subtree
+            stack.append(next_input)
+            next_input += 1
+        stack.pop()
+
+    return position
+
+
+def unrank(n, k):
+    """
+    Build the k-th stack-realizable permutation of 1..n directly.
+
+    Args:
+    - n (int, iterable or str): Number of elements, or the input labels in injection order.
+    - k (int): Zero-based index in the enumeration order.
+
+    Returns:
+    - list: The permutation iter_stack_permutations yields at index k.
+
+    Raises:
+    - ValueError: If k is outside 0..count_stack_permutations(n) - 1.
+    """
+    n, labels = _resolve(n)
+    if not 0 <= k < count_stack_permutations(n):
+        raise ValueError("Error: The index is out of range.")
+    values = labels.labels if labels else list(range(1, n + 1))
+    return list(next(_enumerate(values, k)))                                                                # Positioned descent, no enumeration
+
+
+def _replay_prefix(n, prefix):
+    """
+    Run the unique push/pop sequence that outputs `prefix` from 1..n.
+
+    Returns:
+    - tuple: (stack, next input) after the prefix, or None if no stack permutation starts with it.
+    """
+    stack = []
+    next_input = 1
+    for element in prefix:
+        while not stack or stack[-1] != element:
+            if next_input > min(element, n):
+                return None
+            stack.append(next_input)
+            next_input += 1
+        stack.pop()
+    return stack, next_input
+
+
+_CONSTRAINED_MAX_N = 150                                                                                    # Largest n the O(n^4) forbidden-position DP accepts
+
+
+def _constraint_table(n, prefix, forbidden):
+    """
+    Build the interval DP for position constraints.
+
+    Value `lo` is pushed first onto an empty stack, the values lo+1..j pass
+    through above it, then `lo` is output and j+1..hi-1 follow. So the
+    number of ways to output values lo..hi-1 at positions start.. is a sum
+    over j of two smaller intervals, provided `lo` may sit at its position.
+
+    Args:
+    - n (int): Number of elements.
+    - prefix (tuple): Required values at positions 0, 1, ...
+    - forbidden (set): (position, value) pairs that may not occur.
+
+    Returns:
+    - tuple: (ways(lo, hi, start), allowed(position, value)) with 1-based values.
+
+    Raises:
+    - ValueError: If n is above _CONSTRAINED_MAX_N.
+    """
+    if n > _CONSTRAINED_MAX_N:
+        raise ValueError(f"Error: Forbidden positions are only supported for up to {_CONSTRAINED_MAX_N} elements.")
+
+    def allowed(position, value):
+        if position < len(prefix) and prefix[position] != value:
+            return False
+        return (position, value) not in forbidden
+
+    # table[length][lo][start] counts the ways for values lo..lo+length-1;
+    # `start` never exceeds lo - 1, so each row only holds lo starts.
+    table = [[[1] * (n + 1)] * (n + 2)]
+    blocked = [set() for _ in range(n + 2)]
+    for position, value in forbidden:
+        if 0 < value <= n:
+            blocked[value].add(position)
+    for position, value in enumerate(prefix):
+        if 0 < value <= n:
+            blocked[value].update(p for p in range(n) if p != position)
+        for other in range(1, n + 1):
+            if other != value:
+                blocked[other].add(position)
+
+    for length in range(1, n + 1):
+        rows = [None] * (n + 2 - length)
+        for lo in range(1, n + 2 - length):
+            inner = [table[offset][lo + 1] for offset in range(length)]                                     # lo+1..lo+offset pass through above `lo`
+            outer = [table[length - 1 - offset][lo + offset + 1] for offset in range(length)]               # the rest follow once `lo` is out
+            skip = blocked[lo]
+            rows[lo] = [sum(inner[offset][start] * outer[offset][start + offset + 1]
+                            for offset in range(length) if start + offset not in skip)
+                        for start in range(min(lo, n - length + 1))]
+        table.append(rows)
+
+    def ways(lo, hi, start):
+        return table[hi - lo][lo][start]
+
+    return ways, allowed
+
+
+def _check_constraints(n, prefix, forbidden):
+    """
+    Validate the constraint arguments and translate labels to 1..n.
+
+    Returns:
+    - tuple: (n, prefix, forbidden, _LabelMap or None)
+    """
+    n, labels = _resolve(n)
+    if n < 0:
+        raise ValueError("Error: The number of elements should not be negative.")
+    if labels:
+        prefix = labels.encode(prefix)                                                                      # Unknown labels become 0 and match nothing
+        forbidden = ((position, labels.index.get(value, 0)) for position, value in forbidden)
+    prefix = tuple(prefix)
+    if len(prefix) > n:
+        raise ValueError("Error: The prefix is longer than the permutation.")
+    return n, prefix, set(forbidden), labels
+
+
+def count_constrained(n, prefix=(), forbidden=()):
+    """
+    Count the stack-realizable permutations of 1..n that satisfy position constraints.
+
+    With only a prefix, the prefix is replayed and the count comes from the
+    stack height and next input index it leaves behind. Forbidden
+    (position, value) pairs use a bottom-up interval DP in O(n^4) time
+    and O(n^3) space.
+
+    Args:
+    - n (int, iterable or str): Number of elements, or the input labels in injection order.
+    - prefix (sequence): Values the permutation must start with.
+    - forbidden (iterable): (position, value) pairs, with zero-based positions, that may not occur.
+
+    Returns:
+    - int: Exact number of matching permutations.
+
+    Raises:
+    - ValueError: If forbidden pairs are given for more than 150 elements.
+    """
+    n, prefix, forbidden, labels = _check_constraints(n, prefix, forbidden)
+    if not forbidden:
+        state = _replay_prefix(n, prefix)
+        if state is None:
+            return 0
+        stack, next_input = state
+        return _count_completions(len(stack), n - next_input + 1)
+
+    ways, _ = _constraint_table(n, prefix, forbidden)
+    return ways(1, n + 1, 0)
+
+
+def sample_constrained(n, prefix=(), forbidden=(), rng=random):
+    """
+    Draw a uniformly random stack-realizable permutation of 1..n satisfying position constraints.
+
+    Nothing is enumerated. With only a prefix, each remaining pop/push
+    choice is taken with probability proportional to the number of
+    completions behind it, using a closed-form ratio of small integers.
+    Forbidden positions sample from the interval DP of count_constrained.
+
+    Args:
+    - n (int, iterable or str): Number of elements, or the input labels in injection order.
+    - prefix (sequence): Values the permutation must start with.
+    - forbidden (iterable): (position, value) pairs, with zero-based positions, that may not occur.
+    - rng (random.Random): Source of randomness. Defaults to the random module.
+
+    Returns:
+    - list: The sampled permutation, of labels if labels were given.
+
+    Raises:
+    - ValueError: If no permutation satisfies the constraints, or forbidden
+      pairs are given for more than 150 elements.
+    """
+    n, prefix, forbidden, labels = _check_constraints(n, prefix, forbidden)
+    if not forbidden:
+        state = _replay_prefix(n, prefix)
+        if state is None:
+            raise ValueError("Error: No stack-realizable permutation satisfies the constraints.")
+        stack, next_input = state
+        perm = list(prefix)
+        remaining = n - next_input + 1
+        while stack or remaining:
+            height = len(stack)
+            # P(pop) = completions(height - 1, remaining) / completions(height, remaining)
+            if height and (not remaining or rng.randrange((2 * remaining + height) * (height + 1)) < height * (remaining + height + 1)):
+                perm.append(stack.pop())
+            else:
+                stack.append(next_input)
+                next_input += 1
+                remaining -= 1
+        return labels.decode(perm) if labels else perm
+
+    ways, allowed = _constraint_table(n, prefix, forbidden)
+    if not ways(1, n + 1, 0):
+        raise ValueError("Error: No stack-realizable permutation satisfies the constraints.")
+
+    perm = [0] * n
+    intervals = [(1, n + 1, 0)]
+    while intervals:
+        lo, hi, start = intervals.pop()
+        if lo == hi:
+            continue
+        pick = rng.randrange(ways(lo, hi, start))
+        for j in range(lo, hi):
+            if allowed(start + j - lo, lo):
+                weight = ways(lo + 1, j + 1, start) * ways(j + 1, hi, start + j - lo + 1)
+                if pick < weight:
+                    break
+                pick -= weight
+        perm[start + j - lo] = lo                                                                           # `lo` leaves after the values lo+1..j
+        intervals.append((lo + 1, j + 1, start))
+        intervals.append((j + 1, hi, start + j - lo + 1))
+    return labels.decode(perm) if labels else perm
+
+
+def is_stack_realizable(perm, labels=None):
+    """
+    Check whether a sequence is a stack-realizable permutation of 1..n.
+
+    Simulates a single push/pop pass: an element larger than everything
+    pushed so far is reached by pushing, any other element must be on top
+    of the stack.
+
+    Args:
+    - perm (list): Sequence of integers, or of labels, to check.
+    - labels (iterable or str or None): Input labels in injection order. Defaults to 1..n.
+
+    Returns:
+    - bool: True if `perm` is one of the permutations stack_permutations(labels) produces.
+    """
+    if labels is not None:
+        perm = _LabelMap(labels).encode(perm)
+    n = len(perm)
+    stack = []
+    next_input = 1
+    for element in perm:
+        if element >= next_input:
+            if element > n:
+                return False
+            stack.extend(range(next_input, element))                                                        # Push everything up to the element, then pop it
+            next_input = element + 1
+        elif not stack or stack.pop() != element:
+            return False                                                                                    # Buried in the stack, repeated, or out of range
+    return True
+
+
+_BATCH_ROWS = 1 << 16                                                                                       # Rows simulated together by the batch check
+
+
+def is_stack_realizable_batch(perms):
+    """
+    Check many sequences at once, returning a boolean mask.
+
+    Runs the same simulation as is_stack_realizable column by column over
+    all rows. Each row's stack is kept as a "below" pointer table: a push
+    run next..x-1 only records what lies under its first element, since
+    every later element sits on its predecessor.
+
+    Args:
+    - perms (array-like): 2-D array with one sequence of length n per row.
+
+    Returns:
+    - numpy.ndarray: Boolean mask, True where the row is a stack-realizable permutation of 1..n.
+
+    Raises:
+    - ImportError: If NumPy is not installed.
+    - ValueError: If `perms` is not two-dimensional.
+    """
+    if np is None:
+        raise ImportError("NumPy is required for batch validation.")
+
+    perms = np.asarray(perms)
+    if perms.ndim != 2:
+        raise ValueError("Error: Expected a 2-D array of permutations.")
+
+    rows, n = perms.shape
+    dtype = np.int16 if n < np.iinfo(np.int16).max - 1 else np.int32
+    mask = np.empty(rows, dtype=bool)
+    identity = np.arange(1, n + 1, dtype=dtype)
+    pointers = np.arange(-1, n + 1, dtype=dtype)
+    pointers[0] = 0                                                                                         # Popping an empty stack stays empty
+
+    for begin in range(0, rows, _BATCH_ROWS):
+        chunk = perms[begin:begin + _BATCH_ROWS]
+        in_range = ((chunk >= 1) & (chunk <= n)).all(axis=1)
+        chunk = np.where(in_range[:, None], chunk, identity).astype(dtype, copy=False)                      # Park bad rows on a harmless input
+
+        count = len(chunk)
+        index = np.arange(count)
+        below = np.tile(pointers, (count, 1))
+        top = np.zeros(count, dtype=dtype)
+        highest = np.zeros(count, dtype=dtype)                                                              # Largest element pushed so far
+        ok = in_range
+
+        for column in chunk.T:
+            pushed = column > highest
+            runs = index[pushed]
+            below[runs, highest[runs] + 1] = top[runs]                                                      # The new run sits on the old top
+            ok &= pushed | (column == top)
+            top = np.where(pushed, np.where(column - 1 > highest, column - 1, top), below[index, top])
+            np.maximum(highest, column, out=highest)
+
+        mask[begin:begin + count] = ok
+
+    return mask
+
+
+_SHARD_ROWS = 1 << 16                                                                                       # Upper bound on permutations returned by one worker task
+
+
+def _enumerate_shard(n, start, limit):
+    """
+    Enumerate one contiguous range of the output order in a worker process.
+
+    Args:
+    - n (int): Number of elements.
+    - start (int): Index of the first permutation in the shard.
+    - limit (int): Number of permutations in the shard.
+
+    Returns:
+    - bytes or list: The shard's permutations as packed uint8 rows when every
+      element fits in a byte, otherwise as tuples.
+    """
+    if 0 < n < 256:
+        packed = bytearray()
+        for batch in _enumerate(list(range(1, n + 1)), start, packed=True):                                 # Whole batches of packed rows
+            packed += batch
+            if len(packed) >= limit * n:
+                break
+        return bytes(packed[:limit * n])                                                                    # Much cheaper to build and pickle than tuples
+    return list(map(tuple, islice(_enumerate(list(range(1, n + 1)), start), limit)))
+
+
+def _unpack_shard(n, rows, output):
+    """
+    Turn a worker's shard into what the caller asked for.
+
+    Returns:
+    - iterable: Permutation lists, or the shard itself as one item of bytes or a NumPy array.
+    """
+    if output == "bytes":
+        return (rows,)
+    if output == "numpy":
+        return (np.frombuffer(rows, dtype=np.uint8).reshape(-1, n),)
+    if isinstance(rows, bytes):
+        return (list(rows[i:i + n]) for i in range(0, len(rows), n))
+    return map(list, rows)
+
+
+def parallel_stack_permutations(n, workers=None, ordered=True, shard_size=None, output="lists"):
+    """
+    Generate the stack-realizable permutations of 1..n on a process pool.
+
+    The output order is cut into contiguous shards. Each shard starts with
+    a positioned descent to its first permutation, so shards are independent
+    and equally sized no matter how lopsided the search tree is. Only a small
+    window of shards is in flight at a time, so memory stays bounded while
+    the results stream back.
+
+    Turning rows into lists costs the parent about as much as enumerating
+    them serially, which caps the speedup near 1.25x. With output="bytes"
+    or "numpy" each shard is passed on whole, so the parent does almost no
+    work per row.
+
+    Args:
+    - n (int): Number of elements.
+    - workers (int or None): Number of worker processes. Defaults to the CPU count.
+    - ordered (bool): Yield in the same order as iter_stack_permutations. If False,
+      shards are yielded as soon as they finish.
+    - shard_size (int or None): Permutations per worker task. Defaults to an even split.
+    - output (str): "lists" for one list per permutation, "bytes" for each shard as
+      packed rows of n bytes, or "numpy" for each shard as a read-only uint8 array of
+      shape (rows, n). Rows hold 1..n; "bytes" and "numpy" need n below 256.
+
+    Returns:
+    - iterator: The permutations (list) or shards (bytes or numpy.ndarray), in turn.
+
+    Raises:
+    - ValueError: If the output is unknown or cannot hold n, or workers or
+      shard_size is below 1. Arguments are checked when the function is
+      called, not when the first permutation is requested.
+    - ImportError: If output="numpy" and NumPy is not installed.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("Error: The number of workers should be at least 1.")
+    if shard_size is not None and shard_size < 1:
+        raise ValueError("Error: The shard size should be at least 1.")
+    if output not in ("lists", "bytes", "numpy"):
+        raise ValueError(f"Error: Unknown output {output!r}.")
+    if output != "lists" and not 0 < n < 256:
+        raise ValueError("Error: Packed shards need between 1 and 255 elements.")
+    if output == "numpy" and np is None:
+        raise ImportError("NumPy is required for output=\"numpy\".")
+
+    total = count_stack_permutations(n)
+    workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, min(_SHARD_ROWS, -(-total // (workers * 4))))
+    return _run_shards(n, total, workers, ordered, shard_size, output)
+
+
+def _run_shards(n, total, workers, ordered, shard_size, output):
+    """
+    Enumerate the shards of parallel_stack_permutations once its arguments are checked.
+
+    Yields:
+    - list, bytes or numpy.ndarray: The next permutation, or the next shard.
+    """
+    shards = ((start, min(shard_size, total - start)) for start in range(0, total, shard_size))
+
+    executor = ProcessPoolExecutor(workers)
+    try:
+        pending = deque(executor.submit(_enumerate_shard, n, *shard) for shard in islice(shards, 2 * workers))
+
+        while pending:
+            if ordered:
+                finished = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pending.remove(future)
+
+            for future in finished:
+                for shard in islice(shards, 1):                                                             # Keep the window full
+                    pending.append(executor.submit(_enumerate_shard, n, *shard))
+                yield from _unpack_shard(n, future.result(), output)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+_MAGIC = b"SPRM"
+_FORMATS = {"uint8": 0, "varint": 1}                                                                        # Fixed-width rows, or LEB128 ranks
+_HEADER = struct.Struct("<4sBxH")                                                                           # magic, format, padding, n
+_WRITE_CHUNK = 1 << 20                                                                                      # Bytes buffered before each write
+
+
+def _varint(value):
+    """
+    Encode a non-negative integer as an LEB128 varint.
+    """
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return encoded
+
+
+def write_permutations(permutations, n, file):
+    """
+    Write permutations of 1..n in a compact binary form.
+
+    The file starts with an 8-byte header (magic, format, n), followed by
+    one row of n bytes per permutation, so the body can be memory-mapped by
+    read_permutations. Output is gathered into large chunks before each
+    write.
+
+    Args:
+    - permutations (iterable): Stack-realizable permutations of 1..n.
+    - n (int): Length of each permutation.
+    - file (str, path or binary file): Destination; paths are created or overwritten.
+
+    Returns:
+    - int: Number of permutations written.
+
+    Raises:
+    - ValueError: If uint8 rows cannot hold n.
+    """
+    if not 0 < n < 256:
+        raise ValueError("Error: uint8 rows need between 1 and 255 elements.")
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as handle:
+            return write_permutations(permutations, n, handle)
+
+    file.write(_HEADER.pack(_MAGIC, _FORMATS["uint8"], n))
+    count = 0
+    rows_per_chunk = _WRITE_CHUNK // n
+    permutations = iter(permutations)
+    while chunk := bytes(chain.from_iterable(islice(permutations, rows_per_chunk))):
+        file.write(chunk)
+        count += len(chunk) // n
+    return count
+
+
+def write_ranks(ranks, n, file):
+    """
+    Write a selection of permutations of 1..n as varint-encoded ranks.
+
+    Meant for subsets, such as the positions counted off while filtering an
+    enumeration, or rank() of a few sampled permutations: the ranks are
+    written as given, never recomputed. A full enumeration is better
+    written by write_permutations, since its ranks are just 0, 1, 2, ...
+
+    Args:
+    - ranks (iterable): Ranks of the permutations, as from rank().
+    - n (int): Length of each permutation.
+    - file (str, path or binary file): Destination; paths are created or overwritten.
+
+    Returns:
+    - int: Number of ranks written.
+
+    Raises:
+    - ValueError: If n does not fit the file header.
+    """
+    if not 0 <= n <= 0xFFFF:
+        raise ValueError("Error: The permutations are too long for the file header.")
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as handle:
+            return write_ranks(ranks, n, handle)
+
+    file.write(_HEADER.pack(_MAGIC, _FORMATS["varint"], n))
+    count = 0
+    chunk = bytearray()
+    for value in ranks:
+        chunk += _varint(value)
+        count += 1
+        if len(chunk) >= _WRITE_CHUNK:
+            file.write(chunk)
+            chunk.clear()
+    file.write(chunk)
+    return count
+
+
+def _read_header(path):
+    """
+    Read and check a permutation file header.
+
+    Returns:
+    - tuple: (format name, n)
+    """
+    with open(path, "rb") as handle:
+        header = handle.read(_HEADER.size)
+    if len(header) != _HEADER.size or header[:4] != _MAGIC:
+        raise ValueError("Error: Not a permutation file.")
+    _, code, n = _HEADER.unpack(header)
+    for fmt, fmt_code in _FORMATS.items():
+        if fmt_code == code:
+            return fmt, n
+    raise ValueError(f"Error: Unknown format code {code}.")
+
+
+def read_permutations(path):
+    """
+    Memory-map a "uint8" permutation file as a NumPy array without parsing it.
+
+    Args:
+    - path (str or path): File written by write_permutations.
+
+    Returns:
+    - numpy.memmap: Read-only array of shape (count, n), one permutation per row.
+
+    Raises:
+    - ImportError: If NumPy is not installed.
+    - ValueError: If the file is not a "uint8" permutation file.
+    """
+    if np is None:
+        raise ImportError("NumPy is required to memory-map permutation files.")
+    fmt, n = _read_header(path)
+    if fmt != "uint8":
+        raise ValueError("Error: Only uint8 files can be memory-mapped; use read_ranks.")
+    rows = (os.path.getsize(path) - _HEADER.size) // n
+    if not rows:
+        return np.empty((0, n), dtype=np.uint8)                                                             # mmap cannot map an empty body
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size, shape=(rows, n))
+
+
+def read_ranks(path):
+    """
+    Decode a "varint" permutation file lazily.
+
+    Args:
+    - path (str or path): File written by write_ranks.
+
+    Yields:
+    - int: The rank of each stored permutation; unrank(n, r) recovers it.
+
+    Raises:
+    - ValueError: If the file is not a "varint" permutation file.
+    """
+    fmt, _ = _read_header(path)
+    if fmt != "varint":
+        raise ValueError("Error: Not a varint file; use read_permutations.")
+
+    with open(path, "rb") as handle:
+        handle.seek(_HEADER.size)
+        value = shift = 0
+        while chunk := handle.read(_WRITE_CHUNK):
+            for byte in chunk:
+                value |= (byte & 0x7F) << shift
+                if byte & 0x80:
+                    shift += 7
+                else:
+                    yield value
+                    value = shift = 0
+
+
+def stack_permutations(input_list):
+    """
+    Generate stack-realizable permutations from the given input list.
+
+    Args:
+    - input_list (list or str): Distinct labels in injection order, or a comma-separated string of them.
+
+    Returns:
+    - list: List of stack-realizable permutations.
+    """
+    try:
+        return list(iter_stack_permutations(input_list))
+    except ValueError as e:
+        return str(e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate stack-realizable permutations.")
+    parser.add_argument("numbers", nargs="?", help="comma-separated list of numbers (prompted for if omitted)")
+    parser.add_argument("-o", "--output", help="write the permutations in binary form to this file ('-' for stdout) instead of printing them")
+    args = parser.parse_args()
+
+    if args.numbers is not None:
+        input_string = args.numbers
+    elif args.output == "-":
+        parser.error("the numbers must be given as an argument when writing to stdout")
+    else:
+        input_string = input("Enter a comma-separated list of numbers: ")                                   # Input from the user: a comma-separated list of numbers
+
+    try:
+        permutations = iter_stack_permutations(input_string)                                                # Lazily generated permutations
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit()
+
+    if args.output:
+        n = sum(1 for _ in _iter_labels(input_string))                                                      # Only the input length matters here
+        output = sys.stdout.buffer if args.output == "-" else args.output
+        try:
+            count = write_permutations(_enumerate(list(range(1, n + 1))), n, output)                        # Rows hold label positions 1..n
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Wrote {count} permutations to {args.output}", file=sys.stderr)
+        sys.exit()
+
+    # Display the numbered stack-realizable permutations and the total count
+    print(f"Stack-realizable permutations for input: {input_string}")
+    count = 0
+    for count, p in enumerate(permutations, 1):
+        print(f"{count}. {p}")
+
+    print(f"Total number of stack-realizable permutations: {count}")
@@ -1,122 +1,1308 @@
 # Maze Solver
 
-# Input the size of the square maze
-size = int(input("Enter number(n) of rows for square matrix: (n x n) "))
-visited = {}
-
-# Input maze data row by row
-maze_data = []
-for i in range(size):
-    row = []
-    row_input = input(f"Enter row as space-separated 0s and 1s {i+1}: ").split()
-    for value in row_input:
-        row.append(int(value))
-    maze_data.append(row)
-
-# Initialize the maze by reversing the input data
-maze = [[0 for _ in range(size)] for _ in range(size)]
-for i in range(size):
-    for j in range(size):
-        maze[i][j] = maze_data[size - i - 1][j]
-
-# Print the maze
-print("The maze is: ")
-for i in range(size):
-    for j in range(size):
-        print(maze[size - i - 1][j], end=" ")
-    print()
-
-# Input the starting and ending points
-start_row = int(input("Row number of Starting Point: (check from bottom)")) - 1
-start_col = int(input("Column number of Starting Point: (check from left)")) - 1
-s_x = start_row
-s_y = start_col
-
-end_row = int(input("Row number of Ending Point: (check from bottom)")) - 1
-end_col = int(input("Column number of Ending Point: (check from left)")) - 1
-
-# Initialize the visited dictionary with the starting point
-visited = {str([start_row, start_col]): 0}
-current_path = [[start_row, start_col]]
-
-# Initialize paths and ans lists
-paths = []
-ans = []
-
-# Initialize step counter
-step = 0
-
-# Perform breadth-first search to explore all paths
-while(len(current_path) != 0):
-    for i in range(-1, 2, 1):
-        for j in range(-1, 2, 1):
-            
-            if((str([max(start_row + i, 0), max(start_col + j, 0)]) not in visited) and (start_row + i < size and start_col + j < size)):
-                if(maze[max(start_row + i, 0)][max(start_col + j, 0)] != 1):
-                    visited[str([max(start_row + i, 0), max(start_col + j, 0)])] = visited[str([start_row, start_col])] + 1
-                    current_path.append([max(start_row + i, 0), max(start_col + j, 0)])
-            if((str([min(start_row + i, size - 1), min(start_col + j, size - 1)]) not in visited) and (start_row + i >= 0 and start_col + j >= 0)):
-                if(maze[min(start_row + i, size - 1)][min(start_col + j, size - 1)] != 1):
-                    visited[str([min(start_row + i, size - 1), min(start_col + j, size - 1)])] = visited[str([start_row, start_col])] + 1
-                    current_path.append([min(start_row + i, size - 1), min(start_col + j, size - 1)])
-    current_path.pop(0)
-    if(len(current_path)):
-        start_row = current_path[0][0]
-        start_col = current_path[0][1]
-paths.append([s_x, s_y])
-
-# Construct the path from the starting point to the ending point
-def make_path(s_x, s_y, visited):
+import heapq
+import math
+import mmap
+import os
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
 
+try:
+    import numpy as np
+except ImportError:                                                         # NumPy grids are optional
+    np = None
+
+
+# Neighbourhoods as (row offset, column offset, cost) moves, ordered by row
+# offset, then column offset
+FOUR_WAY = ((-1, 0, 1), (0, -1, 1), (0, 1, 1), (1, 0, 1))
+EIGHT_WAY = tuple((i, j, 1) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j)
+OCTILE = tuple((i, j, math.sqrt(2) if i and j else 1) for i, j, _ in EIGHT_WAY)
+
+# Outcome of a single-pair search: distance and path are None when the end is
+# unreachable, expanded counts the cells whose neighbours were examined
+SearchResult = namedtuple("SearchResult", "distance path expanded")
+
+
+class PackedCells:
+    """
+    Read-only view of a grid stored one bit per cell, 1 for a wall.
+
+    Bits run from the most significant one in each byte and every row is
+    padded to whole bytes, as in PBM images. Indexing by flat cell index
+    gives 1 or 0, like a byte buffer, so a solver reads the bits in place.
+    """
+
+    def __init__(self, buffer, rows, cols, offset=0):
+        '''
+        Inputs: bytes-like object or memory map, number of rows and columns,
+        byte offset of the first row
+        '''
+        self.rows, self.cols = rows, cols
+        self._buffer, self._offset, self._stride = buffer, offset, (cols + 7) // 8
+        if len(buffer) < offset + rows * self._stride:
+            raise ValueError(f"{len(buffer) - offset} bytes are too few for a packed {rows}x{cols} grid")
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __getitem__(self, index):
+        row, col = divmod(index, self.cols)
+        return self._buffer[self._offset + row * self._stride + (col >> 3)] >> (7 - (col & 7)) & 1
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def walls(self):
+        '''
+        Result: 2-D NumPy boolean array, True for walls
+        '''
+        packed = np.frombuffer(self._buffer, dtype=np.uint8, count=self.rows * self._stride, offset=self._offset)
+        return np.unpackbits(packed.reshape(self.rows, self._stride), axis=1, count=self.cols).view(bool)
+
+
+class MazeSolver:
+    """
+    Shortest paths through a grid maze.
+
+    A cell holding 1 is a wall, any other value is open. Moves go to any of
+    the 8 neighbouring cells, or only the 4 sharing a side with
+    connectivity=4, and each move costs 1. Cells are (row, col)
+    pairs indexing the grid as given, starting from 0, or counting rows up
+    from the last one with bottom_up=True.
+
+    The solver only keeps the grid. Buffers (bytes, memory maps, uint8 or
+    bool NumPy arrays) are used in place rather than copied. Every query
+    builds its own search state, so one solver can be reused for many
+    queries and shared between threads.
+    """
+
+    ENGINES = ("bfs", "wavefront")
+    STRATEGIES = ("bfs", "astar", "bidirectional")
+
+    def __init__(self, grid, width=None, engine="bfs", bottom_up=False, connectivity=8):
+        '''
+        Inputs: grid as a list of lists, a 2-D NumPy array, a flat
+        bytes-like object or memory map of cell values together with its
+        row width, or a PackedCells view; the default engine for distance
+        maps, "bfs" or "wavefront"; whether row 0 is the last row of the
+        grid; 4 or 8 neighbours per cell
+        '''
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of {self.ENGINES}")
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity must be 4 or 8, not {connectivity!r}")
+        self.engine = engine
+        self.bottom_up = bottom_up
+        self.connectivity = connectivity
+        if isinstance(grid, PackedCells):
+            self.rows, self.cols = grid.rows, grid.cols
+            self._cells = grid
+        elif isinstance(grid, (bytes, bytearray, memoryview, mmap.mmap)):
+            if isinstance(grid, memoryview) and (grid.ndim != 1 or grid.itemsize != 1):
+                grid = grid.cast('B')
+            if not width or len(grid) % width:
+                raise ValueError("a flat grid needs a width that divides its length")
+            self.rows, self.cols = len(grid) // width, width
+            self._cells = grid
+        elif np is not None and isinstance(grid, np.ndarray):
+            if grid.ndim != 2:
+                raise ValueError("a NumPy grid must be 2-D")
+            self.rows, self.cols = grid.shape
+            if grid.dtype in (np.uint8, np.bool_) and grid.flags.c_contiguous:
+                self._cells = memoryview(grid).cast('B')                    # Bytes already hold 1 for walls
+            else:
+                self._cells = bytes((grid == 1).astype(np.uint8).ravel())
+        else:
+            self.rows, self.cols = len(grid), len(grid[0]) if grid else 0
+            if any(len(row) != self.cols for row in grid):
+                raise ValueError("all rows of the grid must have the same length")
+            self._cells = bytes(1 if value == 1 else 0 for row in grid for value in row)
+        moves = EIGHT_WAY if connectivity == 8 else FOUR_WAY
+        self._steps = [tuple(step for step, _ in steps) for steps in self._neighbour_steps(moves)]
+
+    def is_open(self, cell):
+        '''
+        Inputs: (row, col)
+
+        Result: True if the cell lies inside the grid and is not a wall
+        '''
+        row, col = cell
+        if self.bottom_up:
+            row = self.rows - 1 - row
+        return 0 <= row < self.rows and 0 <= col < self.cols and self._cells[row * self.cols + col] != 1
+
+    def cell_id(self, cell):
+        '''
+        Inputs: (row, col)
+
+        Result: flat index of the cell in the grid's own row order, row * cols + col
+        '''
+        row, col = cell
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"cell {cell} lies outside the {self.rows}x{self.cols} grid")
+        if self.bottom_up:
+            row = self.rows - 1 - row
+        return row * self.cols + col
+
+    def cell_of(self, index):
+        '''
+        Inputs: flat index
+
+        Result: (row, col)
+        '''
+        row, col = divmod(index, self.cols)
+        return (self.rows - 1 - row, col) if self.bottom_up else (row, col)
+
+    def _neighbour_steps(self, moves):
+        '''
+        Flat index offsets of the in-grid neighbours, for every kind of border cell
+
+        Inputs: (row offset, column offset, cost) moves, offsets between -1 and 1
+
+        Result: list indexed by (not top) | (not bottom) << 1 | (not left) << 2 | (not right) << 3,
+        each entry a tuple of (flat offset, cost) in the order of the moves.
+        Borders and flat offsets are in the grid's own row order, row offsets
+        in the rows the caller sees, so bottom_up mazes list neighbours as a
+        reversed grid would
+        '''
+        cols = self.cols
+        table = []
+        for kind in range(16):
+            steps = []
+            for i, j, cost in moves:
+                k = -i if self.bottom_up else i
+                if (k == -1 and not kind & 1) or (k == 1 and not kind & 2):
+                    continue
+                if (j == -1 and not kind & 4) or (j == 1 and not kind & 8):
+                    continue
+                steps.append((k * cols + j, cost))
+            table.append(tuple(steps))
+        return table
+
+    def _neighbours(self, index):
+        row, col = divmod(index, self.cols)
+        return self._steps[(row > 0) | (row < self.rows - 1) << 1 | (col > 0) << 2 | (col < self.cols - 1) << 3]
+
+    def distance_map(self, start, engine=None):
+        '''
+        Least distance from a starting cell to every cell
+
+        Inputs: start cell; engine, defaulting to the solver's
+
+        Result: sequence indexed by flat cell index, holding the least
+        distance of every reachable cell and -1 everywhere else.
+        "bfs" returns an array('i'), "wavefront" a NumPy int32 array
+        '''
+        return self.multi_source_map([start], engine)
+
+    def multi_source_map(self, starts, engine=None, targets=None, wanted=None):
+        '''
+        Least distance from the nearest of several starting cells to every cell
+
+        All starts are at distance 0 and the search runs once, however many
+        there are. With targets, it stops as soon as `wanted` of them (by
+        default all) have their distance, and cells further out are left at -1.
+
+        Inputs: start cells; engine, defaulting to the solver's; target
+        cells; number of targets to reach
+
+        Result: distance map, as for distance_map
+        '''
+        engine = engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown engine {engine!r}, expected one of {self.ENGINES}")
+        sources = [self.cell_id(start) for start in starts]
+        goals = None
+        if targets is not None:
+            goals = {self.cell_id(target) for target in targets}
+            wanted = len(goals) if wanted is None else min(wanted, len(goals))
+        if engine == "wavefront":
+            return self._wavefront_map(sources, goals, wanted)
+        return self._bfs_map(sources, goals, wanted)
+
+    def _bfs_map(self, sources, goals=None, wanted=None):
+        '''
+        Breadth-first search, one cell at a time
+
+        A cell's distance is final when it is first reached, so the search
+        can return the moment the last wanted goal is reached.
+        '''
+        cells, cols, rows = self._cells, self.cols, self.rows
+        distances = array('i', [-1]) * (rows * cols)
+        queue = deque()
+        for source in sources:
+            if cells[source] != 1 and distances[source] < 0:
+                distances[source] = 0
+                queue.append(source)
+
+        goals = goals or frozenset()
+        remaining = (wanted or 0) - sum(1 for goal in goals if distances[goal] == 0)
+        if goals and remaining <= 0:
+            return distances
+
+        steps = self._steps
+        while queue:
+            current = queue.popleft()
+            step_distance = distances[current] + 1
+            row, col = divmod(current, cols)
+            for step in steps[(row > 0) | (row < rows - 1) << 1 | (col > 0) << 2 | (col < cols - 1) << 3]:
+                neighbour = current + step
+                if distances[neighbour] < 0 and cells[neighbour] != 1:
+                    distances[neighbour] = step_distance
+                    queue.append(neighbour)
+                    if neighbour in goals:
+                        remaining -= 1
+                        if not remaining:
+                            return distances
+        return distances
+
+    def _wavefront_map(self, sources, goals=None, wanted=None):
+        '''
+        Breadth-first search that expands a whole layer per NumPy step
+
+        The frontier is an array of cell indices in a copy of the grid padded
+        with a wall border, so neighbours never need bounds checks. Each layer
+        adds the neighbour offsets to every frontier cell at once and keeps
+        the ones still open in a boolean mask. Duplicates are removed without
+        sorting: every candidate writes its own marker into the distance map,
+        and only the one whose marker survives is kept. Work per layer is
+        proportional to the frontier, not to the grid. With goals, the
+        search stops after the layer that reaches the last wanted one.
+        '''
+        if np is None:
+            raise ImportError("NumPy is required for the wavefront engine")
+
+        rows, cols = self.rows, self.cols
+        width = cols + 2
+        distances = np.full(rows * cols, -1, dtype=np.int32)
+        sources = np.unique(np.array([source for source in sources if self._cells[source] != 1], dtype=np.int64))
+        if not len(sources):
+            return distances
+
+        free = np.zeros((rows + 2, width), dtype=bool)                      # Open and not yet reached
+        free[1:-1, 1:-1] = ~self._walls()
+        free = free.ravel()
+        steps = np.array([i * width + j for i, j, _ in (EIGHT_WAY if self.connectivity == 8 else FOUR_WAY)])
+
+        frontier = sources + width + 1 + 2 * (sources // cols)              # Grid index to padded index
+        free[frontier] = False
+        distances[sources] = 0
+        goals = np.array(sorted(goals or ()), dtype=np.int64)
+
+        layer = 0
+        while len(frontier) and not (len(goals) and np.count_nonzero(distances[goals] >= 0) >= wanted):
+            layer += 1
+            candidates = (frontier[:, None] + steps).ravel()
+            candidates = candidates[free[candidates]]
+            cells = candidates - (width + 1) - 2 * (candidates // width - 1)   # Padded index to grid index
+            markers = -2 - np.arange(len(cells), dtype=np.int32)
+            distances[cells] = markers
+            unique = distances[cells] == markers
+            frontier, cells = candidates[unique], cells[unique]
+            distances[cells] = layer
+            free[frontier] = False
+        return distances
+
+    def nearest(self, starts, targets, engine=None):
+        '''
+        Shortest path from the nearest of several starts to the nearest of several targets
+
+        One search runs from all starts at once and stops at the first
+        target it reaches.
+
+        Inputs: start cells, target cells; engine, defaulting to the solver's
+
+        Result: SearchResult(distance, path, expanded), expanded counting the
+        cells reached; of equally near targets the first listed is taken
+        '''
+        targets = list(targets)
+        distances = self.multi_source_map(starts, engine, targets, 1)
+        reached = [(int(distances[index]), order, index)
+                   for order, index in enumerate(map(self.cell_id, targets)) if distances[index] >= 0]
+        expanded = len(distances) - (distances.count(-1) if isinstance(distances, array) else np.count_nonzero(distances < 0))
+        if not reached:
+            return SearchResult(None, None, expanded)
+        distance, _, target = min(reached)
+        path = [self.cell_of(index) for index in reversed(self._walk_back(distances, target))]
+        return SearchResult(distance, path, expanded)
+
+    def distances_to(self, starts, targets, engine=None):
+        '''
+        Least distance from the nearest of several starts to each of several targets
+
+        The search stops as soon as every target has its distance.
+
+        Inputs: start cells, target cells; engine, defaulting to the solver's
+
+        Result: list of distances in target order, None for unreachable targets
+        '''
+        targets = list(targets)
+        distances = self.multi_source_map(starts, engine, targets)
+        return [None if distances[index] < 0 else int(distances[index]) for index in map(self.cell_id, targets)]
+
+    def _walls(self):
+        '''
+        Result: 2-D NumPy boolean array, True for walls, in the grid's own row order
+        '''
+        if isinstance(self._cells, PackedCells):
+            return self._cells.walls()
+        return np.frombuffer(self._cells, dtype=np.uint8).reshape(self.rows, self.cols) == 1
+
+    def distance(self, start, end):
+        '''
+        Result: least distance from start to end, or None if unreachable
+        '''
+        distance = int(self.distance_map(start)[self.cell_id(end)])
+        return None if distance < 0 else distance
+
+    def shortest_path(self, start, end):
+        '''
+        Result: one shortest path as a list of cells, or None if unreachable
+
+        Walks back from the end, always to a neighbour one step closer to the start
+        '''
+        distances = self.distance_map(start)
+        current = self.cell_id(end)
+        if distances[current] < 0:
+            return None
+
+        return [self.cell_of(index) for index in reversed(self._walk_back(distances, current))]
+
+    def _walk_back(self, distances, current):
+        '''
+        Flat indices from a cell back to the source of a distance map, always
+        stepping to the first neighbour one step closer
+        '''
+        path = [current]
+        while distances[current]:
+            previous = distances[current] - 1
+            current = next(current + step for step in self._neighbours(current) if distances[current + step] == previous)
+            path.append(current)
+        return path
+
+    def search(self, start, end, strategy="astar"):
+        '''
+        One shortest path between two cells, with the work it took
+
+        "bfs" floods every reachable cell from the start, "astar" expands
+        cells in order of distance so far plus the Chebyshev distance to the
+        end (Manhattan with 4-way moves), which never overestimates, and
+        "bidirectional" grows breadth-first layers from both ends until
+        they meet.
+
+        Inputs: start cell, end cell, strategy
+
+        Result: SearchResult(distance, path, expanded)
+        '''
+        source, target = self.cell_id(start), self.cell_id(end)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}, expected one of {self.STRATEGIES}")
+        if self._cells[source] == 1 or self._cells[target] == 1:
+            return SearchResult(None, None, 0)
+        if strategy == "astar":
+            return self._astar(source, target)
+        if strategy == "bidirectional":
+            return self._bidirectional(source, target)
+
+        distances = self._bfs_map([source])
+        expanded = len(distances) - distances.count(-1)
+        if distances[target] < 0:
+            return SearchResult(None, None, expanded)
+        path = [self.cell_of(index) for index in reversed(self._walk_back(distances, target))]
+        return SearchResult(distances[target], path, expanded)
+
+    def _astar(self, source, target, landmarks=()):
+        '''
+        A* search with the Chebyshev heuristic, or Manhattan with 4-way moves
+
+        The heuristic is consistent, so a cell is final the first time it is
+        popped. Ties on the estimate go to the cell furthest from the start,
+        which heads straight for the end across open ground.
+
+        Distance maps from landmark cells tighten the estimate: by the
+        triangle inequality a cell is at least |d(L, end) - d(L, cell)| from
+        the end for every landmark L. A cell a landmark reaches while not
+        reaching the end (or the other way round) is cut off from the end
+        and never queued.
+        '''
+        cells, cols, rows, steps = self._cells, self.cols, self.rows, self._steps
+        target_row, target_col = divmod(target, cols)
+        bounds = [(distances, distances[target]) for distances in landmarks]
+        diagonal = self.connectivity == 8
+
+        def estimate(index):
+            row, col = divmod(index, cols)
+            if diagonal:
+                bound = max(abs(row - target_row), abs(col - target_col))
+            else:
+                bound = abs(row - target_row) + abs(col - target_col)
+            for distances, to_target in bounds:
+                distance = distances[index]
+                if (distance < 0) != (to_target < 0):
+                    return None
+                if abs(distance - to_target) > bound:
+                    bound = abs(distance - to_target)
+            return bound
+
+        costs = array('i', [-1]) * (rows * cols)
+        parents = array('i', [-1]) * (rows * cols)
+        closed = bytearray(rows * cols)
+
+        costs[source] = 0
+        bound = estimate(source)
+        heap = [] if bound is None else [(bound, 0, source)]
+        expanded = 0
+        while heap:
+            _, cost, current = heapq.heappop(heap)
+            cost = -cost
+            if closed[current]:
+                continue                                                    # Stale entry, reached more cheaply since
+            closed[current] = 1
+            expanded += 1
+            if current == target:
+                path = [current]
+                while current != source:
+                    current = parents[current]
+                    path.append(current)
+                return SearchResult(cost, [self.cell_of(index) for index in reversed(path)], expanded)
+
+            cost += 1
+            row, col = divmod(current, cols)
+            for step in steps[(row > 0) | (row < rows - 1) << 1 | (col > 0) << 2 | (col < cols - 1) << 3]:
+                neighbour = current + step
+                if cells[neighbour] != 1 and not closed[neighbour] and not 0 <= costs[neighbour] <= cost:
+                    bound = estimate(neighbour)
+                    if bound is not None:
+                        costs[neighbour] = cost
+                        parents[neighbour] = current
+                        heapq.heappush(heap, (cost + bound, -cost, neighbour))
+        return SearchResult(None, None, expanded)
+
+    def _bidirectional(self, source, target):
+        '''
+        Breadth-first search from both ends, one whole layer at a time
+
+        The smaller frontier is expanded next. Once a layer touches cells
+        reached from the other end, the rest of that layer is still expanded
+        so the best meeting cell is found, and the search stops.
+        '''
+        cells, cols, rows, steps = self._cells, self.cols, self.rows, self._steps
+        forward = array('i', [-1]) * (rows * cols)
+        backward = array('i', [-1]) * (rows * cols)
+        forward[source] = backward[target] = 0
+        frontiers = ([source], [target])
+        expanded = 0
+        if source == target:
+            return SearchResult(0, [self.cell_of(source)], expanded)
+
+        best, meeting = None, None
+        while frontiers[0] and frontiers[1] and meeting is None:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            ours, theirs = (forward, backward) if side == 0 else (backward, forward)
+            layer = []
+            for current in frontiers[side]:
+                expanded += 1
+                step_distance = ours[current] + 1
+                row, col = divmod(current, cols)
+                for step in steps[(row > 0) | (row < rows - 1) << 1 | (col > 0) << 2 | (col < cols - 1) << 3]:
+                    neighbour = current + step
+                    if cells[neighbour] == 1:
+                        continue
+                    if theirs[neighbour] >= 0:
+                        total = step_distance + theirs[neighbour]
+                        if best is None or total < best:
+                            best, meeting = total, (current, neighbour)
+                    if ours[neighbour] < 0:
+                        ours[neighbour] = step_distance
+                        layer.append(neighbour)
+            frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+
+        if meeting is None:
+            return SearchResult(None, None, expanded)
+        near, far = meeting if side == 0 else meeting[::-1]                 # near is reached from the start, far from the end
+        path = self._walk_back(forward, near)[::-1] + self._walk_back(backward, far)
+        return SearchResult(best, [self.cell_of(index) for index in path], expanded)
+
+    def _geodesic_layers(self, start, end):
+        '''
+        Shortest-path DAG between two cells, grouped by distance from the start
+
+        Inputs: start cell, end cell
+
+        Result: (dag, layers), where layers[d] lists the DAG cells at distance
+        d from the start; ({}, []) if the end is unreachable
+        '''
+        source, target = self.cell_id(start), self.cell_id(end)
+        forward = self.distance_map(start)
+        if forward[target] < 0:
+            return {}, []
+        backward = self.distance_map(end)
+
+        dag = {source: ()}
+        layers = []
+        layer = [source]
+        while layer:
+            layers.append(layer)
+            following = []
+            for current in layer:
+                ahead, behind = forward[current] + 1, backward[current] - 1
+                successors = tuple(neighbour for neighbour in (current + step for step in self._neighbours(current))
+                                   if forward[neighbour] == ahead and backward[neighbour] == behind)
+                dag[current] = successors
+                for neighbour in successors:
+                    if neighbour not in dag:
+                        dag[neighbour] = ()                                 # Claimed for the next layer
+                        following.append(neighbour)
+            layer = following
+        return dag, layers
+
+    def geodesic_dag(self, start, end):
+        '''
+        Shortest-path DAG between two cells
+
+        A cell lies on some shortest path exactly when its distance from the
+        start plus its distance to the end (a backward search from the end)
+        equals the least distance. Only those cells are kept, so every edge
+        leads on towards the end.
+
+        Inputs: start cell, end cell
+
+        Result: dictionary mapping the flat index of every cell on a shortest
+        path to the tuple of its successors, in neighbour order; empty if the
+        end is unreachable
+        '''
+        return self._geodesic_layers(start, end)[0]
+
+    def count_shortest_paths(self, start, end):
+        '''
+        Count the shortest paths between two cells without listing them
+
+        Inputs: start cell, end cell
+
+        Result: exact number of shortest paths, 0 if unreachable
+        '''
+        dag, layers = self._geodesic_layers(start, end)
+        if not dag:
+            return 0
+
+        # Paths from a cell to the end, filled in one layer at a time from the end
+        ways = {self.cell_id(end): 1}
+        for layer in reversed(layers[:-1]):
+            for current in layer:
+                ways[current] = sum(ways[successor] for successor in dag[current])
+        return ways[self.cell_id(start)]
+
+    def all_shortest_paths(self, start, end):
+        '''
+        Generate all shortest paths
+
+        Walks the shortest-path DAG depth first, so every branch taken
+        reaches the end and no work is spent on dead ends.
+
+        Inputs: start cell, end cell
+
+        Result: iterator over shortest paths, each a list of cells from start to end
+        '''
+        source, target = self.cell_id(start), self.cell_id(end)
+        dag = self.geodesic_dag(start, end)
+        if not dag:
+            return
+        if source == target:
+            yield [self.cell_of(source)]
+            return
+
+        path = [source]
+        branches = [iter(dag[source])]
+        while branches:
+            neighbour = next(branches[-1], None)
+            if neighbour is None:
+                branches.pop()                                              # Backtrack once every successor is explored
+                path.pop()
+            elif neighbour == target:
+                yield [self.cell_of(index) for index in path] + [self.cell_of(target)]
+            else:
+                path.append(neighbour)
+                branches.append(iter(dag[neighbour]))
+
+
+class WeightedSolver:
+    """
+    Least-cost paths when moves and cells have costs.
+
+    Entering a cell costs the cost of the move times the weight of the
+    cell. Walls come from the grid as for MazeSolver, whose `solver` this
+    builds on. The engine follows from the step costs that can occur:
+    breadth-first search when every step costs the same, 0-1 BFS on a
+    deque when a step costs either nothing or one fixed amount, and
+    Dijkstra's algorithm on a binary heap otherwise.
+    """
+
+    ENGINES = ("bfs", "0-1 bfs", "dijkstra")
+
+    def __init__(self, grid, width=None, moves=EIGHT_WAY, weights=None, bottom_up=False):
+        '''
+        Inputs: grid, width and row order as for MazeSolver; (row offset,
+        column offset, cost) moves such as FOUR_WAY, EIGHT_WAY or OCTILE;
+        non-negative cell weights as a flat sequence in the grid's own row
+        order, a list of lists or a 2-D NumPy array, all 1 by default
+        '''
+        self.solver = MazeSolver(grid, width, bottom_up=bottom_up)
+        moves = tuple(moves)
+        for i, j, cost in moves:
+            if not (-1 <= i <= 1 and -1 <= j <= 1 and (i or j)):
+                raise ValueError(f"a move must go to a neighbouring cell, not by {(i, j)}")
+            if cost < 0:
+                raise ValueError(f"move costs must not be negative, {(i, j)} costs {cost}")
+        self.moves = moves
+        self._steps = self.solver._neighbour_steps(moves)
+
+        size = self.solver.rows * self.solver.cols
+        if weights is None:
+            self._weights = None
+            factors = {1}
+        else:
+            if np is not None and isinstance(weights, np.ndarray):
+                weights = array('d', weights.astype(np.float64).ravel().tobytes())
+            elif len(weights) and not isinstance(weights[0], (int, float)):
+                weights = array('d', (weight for row in weights for weight in row))
+            else:
+                weights = array('d', weights)
+            if len(weights) != size:
+                raise ValueError(f"{len(weights)} weights given for {size} cells")
+            if min(weights, default=0) < 0:
+                raise ValueError("cell weights must not be negative")
+            self._weights = weights
+            factors = set(weights)
+
+        costs = {cost * factor for _, _, cost in moves for factor in factors}
+        if len(costs) == 1:
+            self.engine = "bfs"
+        elif len(costs) == 2 and 0 in costs:
+            self.engine = "0-1 bfs"
+        else:
+            self.engine = "dijkstra"
+        self._unit = max(costs)                                             # The one nonzero step cost, for the first two
+
+    def _search(self, source, target=None):
+        '''
+        Run the engine from a flat index, stopping once target is settled
+
+        Result: distances (array('d'), -1 where not reached), parents
+        (array('i')) and the number of cells expanded. After an early stop
+        only settled cells are sure to hold their least cost
+        '''
+        cells, cols, rows = self.solver._cells, self.solver.cols, self.solver.rows
+        steps, weights = self._steps, self._weights
+        distances = array('d', [-1.0]) * (rows * cols)
+        parents = array('i', [-1]) * (rows * cols)
+        if cells[source] == 1:
+            return distances, parents, 0
+
+        distances[source] = 0.0
+        expanded = 0
+        if self.engine == "bfs":
+            unit = self._unit
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                expanded += 1
+                if current == target:
+                    break
+                step_distance = distances[current] + unit
+                row, col = divmod(current, cols)
+                for step, _ in steps[(row > 0) | (row < rows - 1) << 1 | (col > 0) << 2 | (col < cols - 1) << 3]:
+                    neighbour = current + step
+                    if distances[neighbour] < 0 and cells[neighbour] != 1:
+                        distances[neighbour] = step_distance
+                        parents[neighbour] = current
+                        queue.append(neighbour)
+            return distances, parents, expanded
+
+        # Both remaining engines settle cells in order of distance, so a cell
+        # popped again after it was settled is skipped
+        settled = bytearray(rows * cols)
+        zero_one = self.engine == "0-1 bfs"
+        pending = deque([source]) if zero_one else [(0.0, source)]
+        while pending:
+            if zero_one:
+                current = pending.popleft()
+            else:
+                current = heapq.heappop(pending)[1]
+            if settled[current]:
+                continue
+            settled[current] = 1
+            expanded += 1
+            if current == target:
+                break
+            distance = distances[current]
+            row, col = divmod(current, cols)
+            for step, cost in steps[(row > 0) | (row < rows - 1) << 1 | (col > 0) << 2 | (col < cols - 1) << 3]:
+                neighbour = current + step
+                if cells[neighbour] == 1 or settled[neighbour]:
+                    continue
+                if weights is not None:
+                    cost *= weights[neighbour]
+                total = distance + cost
+                if distances[neighbour] < 0 or total < distances[neighbour]:
+                    distances[neighbour] = total
+                    parents[neighbour] = current
+                    if not zero_one:
+                        heapq.heappush(pending, (total, neighbour))
+                    elif cost:
+                        pending.append(neighbour)
+                    else:
+                        pending.appendleft(neighbour)
+        return distances, parents, expanded
+
+    def distance_map(self, start):
+        '''
+        Least cost from a starting cell to every cell
+
+        Inputs: start cell
+
+        Result: array('d') indexed by flat cell index, holding the least
+        cost of every reachable cell and -1 everywhere else
+        '''
+        return self._search(self.solver.cell_id(start))[0]
+
+    def search(self, start, end):
+        '''
+        One least-cost path between two cells, with the work it took
+
+        Inputs: start cell, end cell
+
+        Result: SearchResult(cost, path, expanded)
+        '''
+        source, target = self.solver.cell_id(start), self.solver.cell_id(end)
+        distances, parents, expanded = self._search(source, target)
+        if distances[target] < 0:
+            return SearchResult(None, None, expanded)
+
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        return SearchResult(distances[target], [self.solver.cell_of(index) for index in reversed(path)], expanded)
+
+    def distance(self, start, end):
+        '''
+        Result: least cost from start to end, or None if unreachable
+        '''
+        return self.search(start, end).distance
+
+    def shortest_path(self, start, end):
+        '''
+        Result: one least-cost path as a list of cells, or None if unreachable
+        '''
+        return self.search(start, end).path
+
+
+class MazeIndex:
+    """
+    Cached distance maps for many queries on one unchanging maze.
+
+    Distance maps are kept per source cell in a least recently used cache
+    bounded by `memory` bytes. A query whose start or end has a cached map
+    (moves are symmetric, so either will do) is answered by walking the
+    map, in time proportional to the path length. Other queries run A*,
+    with bounds tightened by the distance maps of `landmarks` cells spread
+    across the maze (ALT). Landmark maps are built once, up front, and do
+    not count against `memory`.
+    """
+
+    def __init__(self, solver, memory=256 << 20, landmarks=0):
+        '''
+        Inputs: MazeSolver for the maze, cache budget in bytes, number of landmarks
+        '''
+        self.solver = solver
+        self.memory = memory
+        self._maps = OrderedDict()
+        self._used = 0
+        self.landmarks = []
+        self._landmark_maps = []
+        for _ in range(landmarks):
+            landmark = self._farthest()
+            if landmark is None:
+                break
+            distances = solver.distance_map(solver.cell_of(landmark))
+            if np is not None and isinstance(distances, np.ndarray):
+                distances = array('i', distances.tobytes())                 # Scalar reads are faster on an array
+            self.landmarks.append(solver.cell_of(landmark))
+            self._landmark_maps.append(distances)
+
+    def _farthest(self):
+        '''
+        Next landmark: the open cell furthest from all landmarks so far. The
+        first one is the cell furthest from the first open cell, which lies
+        on the edge of its part of the maze. Parts no landmark reaches get
+        only the Chebyshev bound.
+
+        Result: flat index, or None when no open cell is left to pick
+        '''
+        maps = self._landmark_maps
+        if not maps:
+            cells = self.solver._cells
+            first = next((index for index in range(len(cells)) if cells[index] != 1), None)
+            if first is None:
+                return None
+            maps = [self.solver._bfs_map([first])]
+        if np is not None:
+            nearest = np.min([np.frombuffer(distances, dtype=np.int32) for distances in maps], axis=0)
+            best = int(np.argmax(nearest))
+        else:
+            nearest = [min(distances) for distances in zip(*maps)]
+            best = max(range(len(nearest)), key=nearest.__getitem__)
+        return best if nearest[best] > 0 or not self._landmark_maps else None
+
+    def distance_map(self, start):
+        '''
+        Distance map from a cell, from the cache when possible
+
+        Inputs: start cell
+
+        Result: the solver's distance map for the cell
+        '''
+        source = self.solver.cell_id(start)
+        if source in self._maps:
+            self._maps.move_to_end(source)
+            return self._maps[source]
+
+        distances = self.solver.distance_map(start)
+        size = self._nbytes(distances)
+        if size <= self.memory:
+            while self._used + size > self.memory:
+                self._used -= self._nbytes(self._maps.popitem(last=False)[1])
+            self._maps[source] = distances
+            self._used += size
+        return distances
+
+    @staticmethod
+    def _nbytes(distances):
+        return len(distances) * distances.itemsize
+
+    def cached(self, cell):
+        '''
+        Result: True if the distance map from the cell is in the cache
+        '''
+        return self.solver.cell_id(cell) in self._maps
+
+    def search(self, start, end):
+        '''
+        One shortest path between two cells
+
+        Inputs: start cell, end cell
+
+        Result: SearchResult(distance, path, expanded); expanded is 0 when
+        a cached map answered the query
+        '''
+        solver = self.solver
+        source, target = solver.cell_id(start), solver.cell_id(end)
+        for known, other, reverse in ((source, target, True), (target, source, False)):
+            if known in self._maps:
+                self._maps.move_to_end(known)
+                distances = self._maps[known]
+                if distances[other] < 0:
+                    return SearchResult(None, None, 0)
+                path = solver._walk_back(distances, other)
+                if reverse:
+                    path.reverse()
+                return SearchResult(int(distances[other]), [solver.cell_of(index) for index in path], 0)
+
+        if solver._cells[source] == 1 or solver._cells[target] == 1:
+            return SearchResult(None, None, 0)
+        return solver._astar(source, target, self._landmark_maps)
+
+    def distance(self, start, end):
+        '''
+        Result: least distance from start to end, or None if unreachable
+        '''
+        return self.search(start, end).distance
+
+    def shortest_path(self, start, end):
+        '''
+        Result: one shortest path as a list of cells, or None if unreachable
+        '''
+        return self.search(start, end).path
+
+
+class IncrementalSolver:
+    """
+    Distances from one start cell, kept up to date while cells change.
+
+    Only the part of the distance map a change affects is repaired. When
+    cells are blocked, the cells whose every shortest route ran through
+    them are found layer by layer, and only those are searched again, from
+    their unaffected neighbours. When cells are opened, the shorter
+    distances they allow spread out from them until they stop improving.
+
+    A repair costs several times more per cell than a full search, so once
+    a change affects more than REPAIR_FRACTION of the reachable cells for
+    the engine, the distance map is rebuilt instead.
+
+    `solver` is a MazeSolver over the same, changing, grid and can be used
+    for any other query on it.
+    """
+
+    REPAIR_FRACTION = {"bfs": 1 / 64, "wavefront": 1 / 512}                 # Repairs cost ~9x a BFS cell, ~90x a wavefront cell
+
+    def __init__(self, grid, start, width=None, engine="bfs", bottom_up=False, connectivity=8):
+        '''
+        Inputs: grid, engine, row order and connectivity as for MazeSolver,
+        the start cell. The grid is copied, since it will change.
+        '''
+        self.solver = MazeSolver(grid, width, engine, bottom_up, connectivity)
+        self.solver._cells = bytearray(self.solver._cells)
+        self.start = start
+        self._source = self.solver.cell_id(start)
+        self._rebuild()
+
+    def _rebuild(self):
+        distances = self.solver.distance_map(self.start)
+        if np is not None and isinstance(distances, np.ndarray):
+            distances = array('i', distances.tobytes())                     # Repairs read single cells
+        self._distances = distances
+        self._reachable = len(distances) - distances.count(-1)
+
+    def distance_map(self):
+        '''
+        Result: the current distance map, an array('i') indexed by flat cell
+        index with -1 for unreachable cells. It is updated in place.
+        '''
+        return self._distances
+
+    def distance(self, end):
+        '''
+        Result: least distance from the start to end, or None if unreachable
+        '''
+        distance = self._distances[self.solver.cell_id(end)]
+        return None if distance < 0 else distance
+
+    def shortest_path(self, end):
+        '''
+        Result: one shortest path from the start as a list of cells, or None if unreachable
+        '''
+        target = self.solver.cell_id(end)
+        if self._distances[target] < 0:
+            return None
+        return [self.solver.cell_of(index) for index in reversed(self.solver._walk_back(self._distances, target))]
+
+    def update_cells(self, updates):
+        '''
+        Change cells and repair the distance map
+
+        Inputs: iterable of (cell, value) pairs; a value of 1 makes the cell
+        a wall, anything else opens it
+
+        Result: number of cells whose distance was searched again
+        '''
+        solver, cells = self.solver, self.solver._cells
+        final = {solver.cell_id(cell): 1 if value == 1 else 0 for cell, value in updates}   # Last update wins
+        blocked, opened = [], []
+        for index, wall in final.items():
+            if cells[index] != wall:
+                cells[index] = wall
+                (blocked if wall else opened).append(index)
+        if not blocked and not opened:
+            return 0
+
+        if self._source not in blocked and self._source not in opened:      # Every distance hangs off the start
+            limit = int(self._reachable * self.REPAIR_FRACTION[solver.engine])
+            repaired = self._block(blocked, limit)
+            if repaired is not None:
+                opened_repaired = self._open(opened, limit - repaired)
+                if opened_repaired is not None:
+                    return repaired + opened_repaired
+        self._rebuild()
+        return self._reachable
+
+    def _block(self, blocked, limit):
+        '''
+        Repair after cells became walls, which can only lengthen distances
+
+        Result: number of cells searched again, or None once more than
+        limit cells are affected, leaving the map for a rebuild
+        '''
+        solver, distances = self.solver, self._distances
+        cells, neighbours = solver._cells, solver._neighbours
+
+        # Cells one layer further out than a lost cell lose their support
+        # unless another neighbour one layer closer is still unaffected
+        lost = [(index, distances[index]) for index in blocked if distances[index] >= 0]
+        for index, _ in lost:
+            distances[index] = -1
+        self._reachable -= len(lost)
+        affected = set()
+        layers = {}
+        for index, distance in lost:
+            for step in neighbours(index):
+                if distances[index + step] == distance + 1:
+                    layers.setdefault(distance + 1, set()).add(index + step)
+        while layers:
+            distance = min(layers)
+            for index in layers.pop(distance):
+                if any(distances[index + step] == distance - 1 and index + step not in affected
+                       for step in neighbours(index)):
+                    continue
+                affected.add(index)
+                if len(affected) > limit:
+                    return None
+                for step in neighbours(index):
+                    if distances[index + step] == distance + 1:
+                        layers.setdefault(distance + 1, set()).add(index + step)
+        if not affected:
+            return 0
+
+        # Search the affected cells again, starting from their settled neighbours
+        for index in affected:
+            distances[index] = -1
+        heap = []
+        for index in affected:
+            best = min((distances[index + step] for step in neighbours(index)
+                        if distances[index + step] >= 0), default=-1)
+            if best >= 0:
+                distances[index] = best + 1
+                heap.append((best + 1, index))
+        heapq.heapify(heap)
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if distance != distances[index]:
+                continue
+            for step in neighbours(index):
+                neighbour = index + step
+                if neighbour in affected and cells[neighbour] != 1 and not 0 <= distances[neighbour] <= distance + 1:
+                    distances[neighbour] = distance + 1
+                    heapq.heappush(heap, (distance + 1, neighbour))
+        self._reachable -= sum(1 for index in affected if distances[index] < 0)
+        return len(affected)
+
+    def _open(self, opened, limit):
+        '''
+        Repair after walls were opened, which can only shorten distances
+
+        Result: number of cells changed, or None once more than limit cells
+        have changed, leaving the map for a rebuild
+        '''
+        distances, cells, neighbours = self._distances, self.solver._cells, self.solver._neighbours
+        heap = []
+        for index in opened:
+            best = min((distances[index + step] for step in neighbours(index)
+                        if distances[index + step] >= 0), default=-1)
+            if best >= 0:
+                distances[index] = best + 1
+                heap.append((best + 1, index))
+                self._reachable += 1
+        heapq.heapify(heap)
+
+        changed = set(opened)
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if distance != distances[index]:
+                continue
+            for step in neighbours(index):
+                neighbour = index + step
+                if cells[neighbour] != 1 and not 0 <= distances[neighbour] <= distance + 1:
+                    if distances[neighbour] < 0:
+                        self._reachable += 1
+                    distances[neighbour] = distance + 1
+                    changed.add(neighbour)
+                    if len(changed) > limit:
+                        return None
+                    heapq.heappush(heap, (distance + 1, neighbour))
+        return len(changed)
+
+
+def _map_file(path):
+    '''
+    Map a whole file read-only
+    '''
+    with open(path, "rb") as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            raise ValueError(f"{path} is empty")
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_raw(path, width, engine="bfs", bottom_up=False):
+    '''
+    Solver over a file of one byte per cell, 1 for a wall, read in place
+
+    Inputs: file path, row width, engine and row order as for MazeSolver
+
+    Result: MazeSolver over a memory map of the file
+    '''
+    return MazeSolver(_map_file(path), width, engine, bottom_up)
+
+
+def load_packed(path, width, height=None, offset=0, engine="bfs", bottom_up=False):
+    '''
+    Solver over a file of one bit per cell, 1 for a wall, read in place
+
+    Inputs: file path, row width, number of rows (defaults to as many as
+    the file holds), byte offset of the first row, engine and row order as
+    for MazeSolver
+
+    Result: MazeSolver over a memory map of the file
+    '''
+    buffer = _map_file(path)
+    if height is None:
+        height = (len(buffer) - offset) // ((width + 7) // 8)
+    return MazeSolver(PackedCells(buffer, height, width, offset), engine=engine, bottom_up=bottom_up)
+
+
+def load_pbm(path, engine="bfs", bottom_up=False):
+    '''
+    Solver over a binary (P4) PBM image, black pixels being walls, read in place
+
+    Inputs: file path, engine and row order as for MazeSolver
+
+    Result: MazeSolver over a memory map of the image
+    '''
+    buffer = _map_file(path)
+    if buffer[:2] != b"P4":
+        raise ValueError(f"{path} is not a binary PBM image")
+
+    # Width and height follow the magic number, separated by whitespace
+    # and comments, and a single whitespace byte ends the header
+    fields, position = [], 2
+    while len(fields) < 2:
+        while position < len(buffer) and buffer[position:position + 1].isspace():
+            position += 1
+        if buffer[position:position + 1] == b"#":
+            position = buffer.find(b"\n", position)
+            if position < 0:
+                break
+            continue
+        end = position
+        while end < len(buffer) and buffer[end:end + 1].isdigit():
+            end += 1
+        if end == position:
+            break
+        fields.append(int(buffer[position:end]))
+        position = end
+    if len(fields) < 2:
+        raise ValueError(f"{path} has a malformed PBM header")
+    width, height = fields
+    return MazeSolver(PackedCells(buffer, height, width, position + 1), engine=engine, bottom_up=bottom_up)
+
+
+_ATTACHED = {}                                                              # Shared grids a worker has mapped, by block name
+
+
+def _share(solver):
     '''
-    function to generate shortest paths
+    Copy a solver's grid into a new shared memory block
 
-    Inputs: start row, start column, list of visited points
+    Result: the block, and the description workers rebuild the solver from
+    '''
+    cells = solver._cells
+    packed = isinstance(cells, PackedCells)
+    if packed:
+        cells = cells._buffer[cells._offset:cells._offset + cells.rows * cells._stride]
+    block = shared_memory.SharedMemory(create=True, size=len(cells))
+    block.buf[:len(cells)] = cells
+    return block, (block.name, len(cells), solver.rows, solver.cols, packed, solver.bottom_up, solver.engine, solver.connectivity)
 
-    Result: None
-    Prints all paths
+
+def _attach(maze):
+    '''
+    Solver over a shared grid, mapped on first use in this process
     '''
-    global ans                                              # Global variable to store the final path
-    global paths                                            # Global variable to store intermediate paths
-    global distance                                         # Global variable to store the distance
-    global end_row                                          # Global variable for the ending row
-    global end_col                                          # Global variable for the ending column
-    
-    for i in range(-1, 2, 1):
-        for j in range(-1, 2, 1):
-            
-            # Check if the neighbor is in the visited dictionary
-            if(str([s_x + i, s_y + j]) in visited):
-                
-                # Check if the neighbor is the next step in the path
-                if(visited[str([s_x + i, s_y + j])] == visited[str([s_x, s_y])] + 1):
-                    paths.append([s_x + i, s_y + j])        # Add the neighbor to the path
-                    
-                    # Check if the path has reached the destination
-                    if len(paths) == distance + 1:
-                        
-                        # Check if the destination is reached
-                        if(paths[-1] == [end_row, end_col]):
-                            print("start here", end="->")
-                            
-                            # Print the path elements
-                            for element in paths:
-                                print("(", element[0] + 1, ",", element[1] + 1, ")", end="->")
-                            print("end reached")
-                    
-                    # Recursively explore the neighbor
-                    make_path(s_x + i, s_y + j, visited)
-                    paths.pop()  # Backtrack by removing the last element from the path
-
-    return ans  # Return the final path
-
-# Check if the maze is unreachable
-if(maze[s_x][s_y] == 1 or maze[end_row][end_col] == 1 or (str([end_row, end_col]) not in visited)):
-    print("unreachable")
-else:
-    # Print the least distance and all possible paths
-    print("The least distance is:", end=" ")
-    print(visited[str([end_row, end_col])])
-    print("All possible paths are:")
-    distance = visited[str([end_row, end_col])]
-    make_path(s_x, s_y, visited)
+    name, size, rows, cols, packed, bottom_up, engine, connectivity = maze
+    if name not in _ATTACHED:
+        block = shared_memory.SharedMemory(name=name)
+        cells = block.buf[:size]                                            # The block may be rounded up to a whole page
+        grid = PackedCells(cells, rows, cols) if packed else cells
+        _ATTACHED[name] = block, MazeSolver(grid, cols, engine, bottom_up, connectivity)
+    return _ATTACHED[name][1]
+
+
+def _solve_job(maze, start, end, strategy):
+    return _attach(maze).search(start, end, strategy)
+
+
+def solve_batch(jobs, workers=None, strategy="astar"):
+    '''
+    Solve independent single-pair queries on a pool of processes
+
+    Every distinct maze is copied once into shared memory, which the
+    workers map, instead of a pickled grid travelling with every job.
+
+    Inputs: iterable of (maze, start, end) jobs, the maze being a
+    MazeSolver or any grid MazeSolver accepts; number of worker processes,
+    defaulting to the number of CPUs; search strategy as for MazeSolver.search
+
+    Result: list of SearchResult, in job order
+    '''
+    if strategy not in MazeSolver.STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}, expected one of {MazeSolver.STRATEGIES}")
+    shared, tasks = {}, []
+    try:
+        for maze, start, end in jobs:
+            if id(maze) not in shared:
+                solver = maze if isinstance(maze, MazeSolver) else MazeSolver(maze)
+                shared[id(maze)] = (maze,) + _share(solver)                 # Holding the maze keeps its id unique
+            tasks.append((shared[id(maze)][2], start, end))
+        if not tasks:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            mazes, starts, ends = zip(*tasks)
+            chunksize = max(1, len(tasks) // (4 * workers))
+            return list(executor.map(_solve_job, mazes, starts, ends, repeat(strategy), chunksize=chunksize))
+    finally:
+        for _, block, _ in shared.values():
+            block.close()
+            block.unlink()
+
+
+if __name__ == "__main__":
+    # Input the size of the square maze
+    size = int(input("Enter number(n) of rows for square matrix: (n x n) "))
+
+    # Input maze data row by row
+    maze_data = []
+    for i in range(size):
+        row = []
+        row_input = input(f"Enter row as space-separated 0s and 1s {i+1}: ").split()
+        for value in row_input:
+            row.append(int(value))
+        maze_data.append(row)
+
+    # Print the maze
+    print("The maze is: ")
+    for i in range(size):
+        for j in range(size):
+            print(maze_data[i][j], end=" ")
+        print()
+
+    # Input the starting and ending points
+    start_row = int(input("Row number of Starting Point: (check from bottom)")) - 1
+    start_col = int(input("Column number of Starting Point: (check from left)")) - 1
+
+    end_row = int(input("Row number of Ending Point: (check from bottom)")) - 1
+    end_col = int(input("Column number of Ending Point: (check from left)")) - 1
+
+    # Rows are numbered from the bottom, which the solver maps onto the input rows
+    solver = MazeSolver(maze_data, bottom_up=True)
+    distance = solver.distance((start_row, start_col), (end_row, end_col))
+
+    # Check if the maze is unreachable
+    if distance is None:
+        print("unreachable")
+    else:
+        # Print the least distance and all possible paths
+        print("The least distance is:", end=" ")
+        print(distance)
+        print("All possible paths are:")
+        # The script has always listed no paths when the start is the end
+        paths = solver.all_shortest_paths((start_row, start_col), (end_row, end_col)) if distance else ()
+        for path in paths:
+            print("start here", end="->")
+
+            # Print the path elements
+            for element in path:
+                print("(", element[0] + 1, ",", element[1] + 1, ")", end="->")
+            print("end reached")
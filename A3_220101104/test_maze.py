@@ -0,0 +1,128 @@
+import random
+from multiprocessing import shared_memory
+
+import pytest
+
+from task2 import _ATTACHED, IncrementalSolver, MazeSolver, _attach, solve_batch
+
+
+def random_maze(rows, cols, density, rng):
+    grid = [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+    grid[0][0] = grid[-1][-1] = 0
+    return grid
+
+
+@pytest.mark.parametrize("connectivity", (4, 8))
+def test_count_shortest_paths_matches_listing(connectivity):
+    rng = random.Random(connectivity)
+    for _ in range(60):
+        rows, cols = rng.randint(1, 6), rng.randint(1, 6)
+        solver = MazeSolver(random_maze(rows, cols, 0.25, rng), connectivity=connectivity)
+        start, end = (0, 0), (rows - 1, cols - 1)
+        assert solver.count_shortest_paths(start, end) == len(list(solver.all_shortest_paths(start, end)))
+
+
+def test_count_shortest_paths_on_open_grid():
+    solver = MazeSolver([[0] * 4 for _ in range(4)], connectivity=4)
+    assert solver.count_shortest_paths((0, 0), (3, 3)) == 20                   # C(6, 3) monotone lattice paths
+    assert solver.count_shortest_paths((2, 1), (2, 1)) == 1
+    assert solver.count_shortest_paths((0, 0), (0, 3)) == 1
+
+
+def test_count_shortest_paths_unreachable():
+    solver = MazeSolver([[0, 1, 0], [1, 1, 0], [0, 0, 0]])
+    assert solver.count_shortest_paths((0, 0), (2, 2)) == 0
+    assert solver.geodesic_dag((0, 0), (2, 2)) == {}
+
+
+def check_against_fresh(live, grid):
+    fresh = MazeSolver(grid, connectivity=live.solver.connectivity).distance_map(live.start)
+    assert list(live.distance_map()) == list(fresh)
+
+
+@pytest.mark.parametrize("engine", ("bfs", "wavefront"))
+@pytest.mark.parametrize("connectivity", (4, 8))
+def test_incremental_solver_matches_fresh_search(engine, connectivity):
+    if engine == "wavefront":
+        pytest.importorskip("numpy")
+    rng = random.Random(connectivity)
+    grid = random_maze(48, 48, 0.3, rng)
+    for row in grid[:3]:
+        row[:3] = [0, 0, 0]                                                     # Keep the start out of a pocket
+    live = IncrementalSolver(grid, (0, 0), engine=engine, connectivity=connectivity)
+    check_against_fresh(live, grid)
+    repaired = rebuilt = 0
+    for _ in range(300):
+        updates = []
+        for _ in range(rng.choice((1, 1, 1, 3, 12))):
+            row, col = rng.randrange(12) if rng.random() < 0.3 else rng.randrange(48), rng.randrange(48)
+            if (row, col) != (0, 0):
+                grid[row][col] = 1 - grid[row][col]
+                updates.append(((row, col), grid[row][col]))
+        limit = int(live._reachable * IncrementalSolver.REPAIR_FRACTION[engine])
+        searched = live.update_cells(updates)
+        if searched > limit:
+            rebuilt += 1
+        elif searched:
+            repaired += 1
+        check_against_fresh(live, grid)
+    assert repaired and rebuilt                                                 # Both sides of REPAIR_FRACTION were exercised
+
+
+def test_incremental_solver_repairs_small_changes_and_rebuilds_large_ones():
+    grid = [[0] * 40 for _ in range(40)]
+    live = IncrementalSolver(grid, (0, 0), connectivity=4)
+    limit = int(live._reachable * IncrementalSolver.REPAIR_FRACTION["bfs"])
+
+    # Cutting off the far corner affects a single cell: repaired in place
+    grid[39][38] = 1
+    assert live.update_cells([((39, 38), 1)]) == 0                             # (39, 39) is still reached through (38, 39)
+    grid[38][39] = 1
+    assert live.update_cells([((38, 39), 1)]) == 1 <= limit
+    assert live.distance((39, 39)) is None
+    check_against_fresh(live, grid)
+
+    # A wall with its only gap at the far end lengthens most distances: rebuilt
+    for col in range(39):
+        grid[1][col] = 1
+    searched = live.update_cells([((1, col), 1) for col in range(39)])
+    assert searched == live._reachable > limit
+    check_against_fresh(live, grid)
+
+    # Opening the wall again shortens most distances: rebuilt
+    for col in range(39):
+        grid[1][col] = 0
+    assert live.update_cells([((1, col), 0) for col in range(39)]) == live._reachable
+    check_against_fresh(live, grid)
+
+    # Blocking and reopening the start itself always rebuilds
+    assert live.update_cells([((0, 0), 1)]) == live._reachable
+    assert live.distance((5, 5)) is None
+    grid[0][0] = 0
+    live.update_cells([((0, 0), 0)])
+    check_against_fresh(live, grid)
+
+
+def test_solve_batch_matches_serial_search():
+    rng = random.Random(19)
+    mazes = [random_maze(rows, cols, 0.25, rng) for rows, cols in ((7, 5), (3, 11), (9, 9))]
+    jobs = [(maze, (0, 0), (len(maze) - 1, len(maze[0]) - 1)) for maze in mazes for _ in range(2)]
+    results = solve_batch(jobs, workers=2)
+    assert [result.distance for result in results] == [MazeSolver(maze).distance(start, end) for maze, start, end in jobs]
+
+
+def test_attach_ignores_padding_after_the_grid():
+    grid = random_maze(3, 5, 0.3, random.Random(5))
+    cells = bytes(value for row in grid for value in row)
+    block = shared_memory.SharedMemory(create=True, size=4096)                 # As if rounded up to a page
+    try:
+        block.buf[:len(cells)] = cells
+        solver = _attach((block.name, len(cells), 3, 5, False, False, "bfs", 8))
+        assert (solver.rows, solver.cols) == (3, 5)
+        assert list(solver.distance_map((0, 0))) == list(MazeSolver(grid).distance_map((0, 0)))
+    finally:
+        attached, solver = _ATTACHED.pop(block.name)
+        solver._cells.release()                                                 # The slice pins the mapping
+        attached.close()
+        block.close()
+        block.unlink()
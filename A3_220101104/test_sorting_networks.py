@@ -0,0 +1,139 @@
+import pytest
+
+from sorting_networks import (ContainerModel, InputRestrictedDeque, OutputRestrictedDeque, ParallelStacks, SeriesStacks,
+                              Stack)
+
+
+def _push_back(containers, i, value):
+    return containers[:i] + (containers[i] + (value,),) + containers[i + 1:]
+
+
+def _drop(containers, i, front=False):
+    return containers[:i] + (containers[i][1:] if front else containers[i][:-1],) + containers[i + 1:]
+
+
+# Each rule lists the raw moves of one network on concrete values, without
+# any of the engine's canonical labelling: (pushes, transfers, pops).
+def stack_moves(k):
+    def pushes(containers, value):
+        yield _push_back(containers, 0, value)
+
+    def pops(containers):
+        if containers[0]:
+            yield containers[0][-1], _drop(containers, 0)
+
+    return k, pushes, lambda containers: (), pops
+
+
+def output_restricted_moves():
+    def pushes(containers, value):
+        yield _push_back(containers, 0, value)
+        yield ((value,) + containers[0],)
+
+    _, _, _, pops = stack_moves(1)
+    return 1, pushes, lambda containers: (), pops
+
+
+def input_restricted_moves():
+    def pops(containers):
+        if containers[0]:
+            yield containers[0][-1], _drop(containers, 0)
+            yield containers[0][0], _drop(containers, 0, front=True)
+
+    _, pushes, _, _ = stack_moves(1)
+    return 1, pushes, lambda containers: (), pops
+
+
+def parallel_moves(k):
+    def pushes(containers, value):
+        for i in range(k):
+            yield _push_back(containers, i, value)
+
+    def pops(containers):
+        for i, stack in enumerate(containers):
+            if stack:
+                yield stack[-1], _drop(containers, i)
+
+    return k, pushes, lambda containers: (), pops
+
+
+def series_moves(k):
+    def transfers(containers):
+        for i in range(k - 1):
+            if containers[i]:
+                yield _push_back(_drop(containers, i), i + 1, containers[i][-1])
+
+    def pops(containers):
+        if containers[-1]:
+            yield containers[-1][-1], _drop(containers, k - 1)
+
+    _, pushes, _, _ = stack_moves(k)
+    return k, pushes, transfers, pops
+
+
+def simulate(moves, n):
+    """
+    Run every operation sequence on 1..n and collect the outputs.
+    """
+    k, pushes, transfers, pops = moves
+    start = (1, ((),) * k, ())
+    seen = {start}
+    frontier = [start]
+    results = set()
+    while frontier:
+        next_input, containers, output = frontier.pop()
+        if len(output) == n:
+            results.add(output)
+            continue
+        following = [(next_input, moved, output) for moved in transfers(containers)]
+        following += [(next_input, popped, output + (value,)) for value, popped in pops(containers)]
+        if next_input <= n:
+            following += [(next_input + 1, pushed, output) for pushed in pushes(containers, next_input)]
+        for config in following:
+            if config not in seen:
+                seen.add(config)
+                frontier.append(config)
+    return results
+
+
+CASES = [
+    (Stack(), stack_moves(1)),
+    (OutputRestrictedDeque(), output_restricted_moves()),
+    (InputRestrictedDeque(), input_restricted_moves()),
+    (ParallelStacks(2), parallel_moves(2)),
+    (ParallelStacks(3), parallel_moves(3)),
+    (SeriesStacks(2), series_moves(2)),
+]
+
+
+@pytest.mark.parametrize("model, moves", CASES, ids=[repr(model) for model, _ in CASES])
+def test_models_match_exhaustive_simulation(model, moves):
+    for n in range(8):
+        expected = simulate(moves, n)
+        produced = list(model.permutations(n))
+        assert produced == sorted(map(list, expected))
+        assert model.count(n) == len(expected)
+
+
+def test_container_model_requires_hooks():
+    class Incomplete(ContainerModel):
+        def initial(self):
+            return ((),)
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_exponential_models_refuse_infeasible_sizes():
+    for model in (ParallelStacks(2), SeriesStacks(2), ParallelStacks(5)):
+        with pytest.raises(ValueError, match="max_n"):
+            model.count(model.max_n + 1)
+        with pytest.raises(ValueError, match="max_n"):
+            next(model.permutations(model.max_n + 1))
+    assert Stack().max_n is None and ParallelStacks(1).max_n is None
+    model = SeriesStacks(2)
+    model.max_n = 3
+    with pytest.raises(ValueError):
+        model.count(4)
+    model.max_n = None                                                          # Lifts the limit
+    assert model.count(4) == 24
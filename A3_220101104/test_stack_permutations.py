@@ -0,0 +1,68 @@
+import random
+from collections import Counter
+
+import pytest
+
+from task1 import count_constrained, iter_stack_permutations, parallel_stack_permutations, sample_constrained
+
+
+def brute_force(n, prefix, forbidden):
+    return [p for p in iter_stack_permutations(list(range(1, n + 1)))
+            if p[:len(prefix)] == list(prefix) and all(p[position] != value for position, value in forbidden if position < n)]
+
+
+def random_constraints(n, rng):
+    perms = list(iter_stack_permutations(list(range(1, n + 1))))
+    prefix = tuple(rng.choice(perms)[:rng.randrange(min(n, 3) + 1)])
+    forbidden = {(rng.randrange(n), rng.randrange(1, n + 1)) for _ in range(rng.randrange(1, 4))}
+    return prefix, forbidden
+
+
+@pytest.mark.parametrize("n", range(1, 9))
+def test_count_constrained_matches_brute_force(n):
+    rng = random.Random(n)
+    for _ in range(25):
+        prefix, forbidden = random_constraints(n, rng)
+        assert count_constrained(n, prefix, forbidden) == len(brute_force(n, prefix, forbidden))
+        assert count_constrained(n, prefix) == len(brute_force(n, prefix, ()))
+
+
+@pytest.mark.parametrize("n", range(1, 9))
+def test_sample_constrained_stays_in_brute_force_set(n):
+    rng = random.Random(n)
+    for _ in range(10):
+        prefix, forbidden = random_constraints(n, rng)
+        for constraints in ((prefix, forbidden), (prefix, ())):
+            matches = brute_force(n, *constraints)
+            if not matches:
+                with pytest.raises(ValueError):
+                    sample_constrained(n, *constraints, rng=rng)
+                continue
+            for _ in range(20):
+                assert sample_constrained(n, *constraints, rng=rng) in matches
+
+
+def test_sample_constrained_is_uniform():
+    rng = random.Random(0)
+    matches = brute_force(5, (2,), {(2, 3)})
+    draws = Counter(tuple(sample_constrained(5, (2,), {(2, 3)}, rng=rng)) for _ in range(200 * len(matches)))
+    assert set(draws) == {tuple(p) for p in matches}
+    assert min(draws.values()) > 100
+
+
+def test_count_constrained_handles_large_n_without_recursion():
+    assert count_constrained(60, forbidden={(0, 1)}) == count_constrained(60) - count_constrained(60, prefix=(1,))
+    with pytest.raises(ValueError):
+        count_constrained(151, forbidden={(0, 1)})
+
+
+@pytest.mark.parametrize("options", [{"workers": 0}, {"workers": -2}, {"shard_size": 0}, {"output": "csv"}])
+def test_parallel_stack_permutations_checks_arguments_on_call(options):
+    with pytest.raises(ValueError, match="^Error:"):
+        parallel_stack_permutations(5, **options)                               # No next() needed
+
+
+def test_parallel_stack_permutations_matches_serial_order():
+    expected = list(iter_stack_permutations(list(range(1, 8))))
+    assert list(parallel_stack_permutations(7, workers=2, shard_size=50)) == expected
+    assert b"".join(parallel_stack_permutations(7, workers=2, output="bytes")) == bytes(v for p in expected for v in p)
@@ -0,0 +1,196 @@
+import argparse
+import sys
+import time
+
+from task1 import CryptArithm
+
+# Puzzles with 10 distinct letters, so every digit is taken
+SUITE = [
+    "DONALD+GERALD=ROBERT",
+    "FORTY+TEN+TEN=SIXTY",
+    "ZEROES+ONES=BINARY",
+    "COUPLE+COUPLE=QUARTET",
+    "EARTH+AIR+FIRE+WATER=NATURE",
+    "ELEVEN+NINE+FIVE+FIVE=THIRTY",
+    "ALPHABET+LETTERS=SCRABBLE",
+    "APPLE+LEMON+BANANA=ORANGE",
+    "THIS+ISA+GREAT+TIME=WASTER",
+    "SATURN+URANUS+NEPTUNE+PLUTO=PLANETS",
+    "SO+MANY+MORE+MEN+SEEM+TO+SAY+THAT+THEY+MAY+SOON+TRY+TO+STAY+AT+HOME+SO+AS+TO+SEE+OR+HEAR"
+    "+THE+SAME+ONE+MAN+TRY+TO+MEET+THE+TEAM+ON+THE+MOON+AS+HE+HAS+AT+THE+OTHER+TEN=TESTS",
+]
+
+
+def legacy_solutions(puzzle):
+    """
+    Reference copy of the original solver chain, which kept digit sets as Python sets.
+
+    The puzzle is parsed by CryptArithm; only the search is replayed, with
+    values and carries kept in dictionaries as the original kept them in
+    attributes.
+
+    Args:
+        puzzle (str): The word math puzzle.
+
+    Yields:
+        Solution: Each solution found.
+    """
+    ca = CryptArithm(puzzle, propagate=False)
+    base = ca._base
+    allowed = {var: {d for d in ca._digits if var._allowed >> d & 1} for var in ca._variables.values()}
+    value = dict.fromkeys(ca._variables.values(), 0)
+    carries = dict.fromkeys(ca._columns, 0)
+
+    def variable(var):
+        def strategy(solver):
+            def solve(used):
+                for digit in allowed[var] - used:
+                    value[var] = digit
+                    yield from solver(used | {digit})
+            return solve
+        return strategy
+
+    def validator(column):
+        def strategy(solver):
+            def validate(used):
+                result = sum(count * value[var] for var, count in column._addends.items())
+                if column._carry_in:
+                    result += carries[column._carry_in]
+                carry, result = result // base, result % base
+                if result == value[column._result] and (carry == 0 or column._carry_to):
+                    carries[column] = carry
+                    yield from solver(used)
+            return validate
+        return strategy
+
+    def for_result(column):
+        def strategy(solver):
+            def solve(used):
+                result = sum(count * value[var] for var, count in column._addends.items())
+                if column._carry_in:
+                    result += carries[column._carry_in]
+                carry, digit = result // base, result % base
+                if digit in allowed[column._result] - used and (carry == 0 or column._carry_to):
+                    value[column._result] = digit
+                    carries[column] = carry
+                    yield from solver(used | {digit})
+            return solve
+        return strategy
+
+    def for_addend(column, addend):
+        def strategy(solver):
+            def solve(used):
+                value[addend] = 0
+                result = sum(count * value[var] for var, count in column._addends.items())
+                if column._carry_in:
+                    result += carries[column._carry_in]
+                multiplier = column._addends[addend]
+                digit = (value[column._result] - result) * multiplier % base
+                result += digit * multiplier
+                carry = result // base
+                if digit in allowed[addend] - used and (carry == 0 or column._carry_to):
+                    value[addend] = digit
+                    carries[column] = carry
+                    yield from solver(used | {digit})
+            return solve
+        return strategy
+
+    strategies = []
+    knowns = set()
+    for column in ca._columns:
+        unknowns = column.unknowns(knowns)
+        if not unknowns:
+            strategies.append(validator(column))
+            continue
+        strategies.extend(variable(var) for var in unknowns[:-1])
+        last = unknowns[-1]
+        if last == column._result and column._addends[last] == 0:
+            strategies.append(for_result(column))
+        elif last != column._result and abs(column._addends[last]) == 1:
+            strategies.append(for_addend(column, last))
+        else:
+            strategies.extend((variable(last), validator(column)))
+        knowns |= set(unknowns)
+
+    def emit(used):
+        yield {var._letter: value[var] for var in ca._variables.values()}
+
+    solver = emit
+    for strategy in reversed(strategies):
+        solver = strategy(solver)
+    yield from solver(set())
+
+
+def _searcher(propagate):
+    def search(puzzle):
+        ca = CryptArithm(puzzle, propagate=propagate)
+        return list(ca.solutions()), ca.nodes
+    return search
+
+
+def _parallel(puzzle):
+    ca = CryptArithm(puzzle)
+    return list(ca.parallel_solutions(depth=2)), ca.nodes
+
+
+# Each engine returns every solution of a puzzle and the search nodes it
+# visited, where it counts them
+ENGINES = {
+    "legacy": lambda puzzle: (list(legacy_solutions(puzzle)), None),
+    "compiled": _searcher(False),
+    "propagated": _searcher(True),
+    "parallel": _parallel,
+}
+
+
+def run_case(engine, puzzle, repeat):
+    """
+    Solve one puzzle with one engine, keeping the best of `repeat` runs.
+
+    Returns:
+        tuple: (seconds, sorted solutions, nodes visited or None)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        solutions, nodes = ENGINES[engine](puzzle)
+        best = min(best, time.perf_counter() - begin)
+    return best, sorted(sorted(solution.items()) for solution in solutions), nodes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CryptArithm search engines.")
+    parser.add_argument("puzzles", nargs="*", default=SUITE, help="puzzles to solve (default: the 10-letter suite)")
+    parser.add_argument("-e", "--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES), help="engines to run (default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per case, the fastest is kept (default: 3)")
+    args = parser.parse_args()
+
+    totals = dict.fromkeys(args.engines, 0.0)
+    visited = {}
+    print(f"{'puzzle':<36}" + "".join(f"{engine:>12}" for engine in args.engines))
+    for puzzle in args.puzzles:
+        timings, reference = [], None
+        name = puzzle if len(puzzle) <= 34 else puzzle[:31] + "..."
+        for engine in args.engines:
+            seconds, solutions, nodes = run_case(engine, puzzle, args.repeat)
+            if reference is None:
+                reference = solutions
+            elif solutions != reference:
+                sys.exit(f"Error: {engine} disagrees with {args.engines[0]} on {puzzle}")
+            totals[engine] += seconds
+            timings.append(seconds)
+            if nodes is not None:
+                visited.setdefault(engine, {})[name] = nodes
+        print(f"{name:<36}" + "".join(f"{seconds * 1000:>10.2f}ms" for seconds in timings))
+
+    print(f"{'total':<36}" + "".join(f"{totals[engine] * 1000:>10.2f}ms" for engine in args.engines))
+    first = args.engines[0]
+    for engine in args.engines[1:]:
+        print(f"{engine}: {totals[first] / totals[engine]:.2f}x faster than {first}")
+
+    # Search nodes visited, for the engines that count them
+    if visited:
+        print(f"\n{'nodes':<36}" + "".join(f"{engine:>12}" for engine in visited))
+        for name in next(iter(visited.values())):
+            print(f"{name:<36}" + "".join(f"{counts[name]:>12,}" for counts in visited.values()))
+        print(f"{'total':<36}" + "".join(f"{sum(counts.values()):>12,}" for counts in visited.values()))
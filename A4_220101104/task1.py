@@ -1,6 +1,14 @@
+import argparse
+import json
+import multiprocessing
+import os
 import re
-from collections import Counter
-from typing import Callable, Iterator, NewType
+import string
+import sys
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice, product
+from typing import Callable, Iterable, Iterator, NewType, Optional, TextIO
 
 # Define custom types
 Term = NewType('Term', str)
@@ -8,13 +16,16 @@ Operator = NewType('Operator', str)
 
 # Flag for tracing
 Solution = dict[str, int]
-Solver = Callable[[set[int]], Iterator[Solution]]
+# Sets of digits are bitmasks: bit d is set when digit d is in the set
+Digits = int
+Solver = Callable[[Digits], Iterator[Solution]]
 
 TRACE = False
 
 class CryptArithm:
 
     SUPPORTED_OPS = {'=', '+'}
+    _ZERO_SLOT = 0      # Slot of the constant 0 at the start of the flat array of values
 
     #---------------------------------------------------------------------------
     
@@ -22,11 +33,12 @@ class CryptArithm:
         """
         A letter-variable in the word-math puzzle.
 
-        Holds the letter, the allowed digits for the letter, and its
-        current candidate value.
+        Holds the letter, the allowed digits for the letter (as a
+        bitmask), and the slot holding its current candidate value in
+        the solver's flat array of values.
         """
 
-        __slots__ = ('_letter', '_allowed', '_value')
+        __slots__ = ('_letter', '_allowed', '_values', '_slot', '_nodes')
 
         def __init__(self, solver: 'CryptArithm', letter: str):
             """
@@ -37,8 +49,22 @@ class CryptArithm:
                 letter (str): The letter associated with the variable.
             """
             self._letter = letter
-            self._allowed = set(solver._digits)
-            self._value = 0
+            self._allowed = (1 << len(solver._digits)) - 1
+            self._values = solver._values
+            self._slot = len(solver._values)
+            solver._values.append(0)
+            self._nodes = solver._nodes
+
+        @property
+        def _value(self) -> int:
+            """
+            The current candidate value of the variable.
+            """
+            return self._values[self._slot]
+
+        @_value.setter
+        def _value(self, value: int) -> None:
+            self._values[self._slot] = value
 
         def exclude(self, *values):
             """
@@ -49,7 +75,30 @@ class CryptArithm:
             Args:
                 *values: Variable number of integers to exclude.
             """
-            self._allowed -= set(values)
+            for value in values:
+                self._allowed &= ~(1 << value)
+
+        def restrict(self, low: int, high: int) -> None:
+            """
+            Keep only the allowed digits between low and high, inclusive.
+
+            Args:
+                low (int): The smallest digit to keep.
+                high (int): The largest digit to keep.
+            """
+            low = max(low, 0)
+            if high < low:
+                self._allowed = 0
+            else:
+                self._allowed &= (1 << high + 1) - (1 << low)
+
+        @property
+        def bounds(self) -> tuple[int, int]:
+            """
+            The smallest and largest allowed digits, or (-1, -1) if none is left.
+            """
+            allowed = self._allowed
+            return (allowed & -allowed).bit_length() - 1, allowed.bit_length() - 1
 
         def solver(self, solver: Solver) -> Solver:
             """
@@ -60,13 +109,15 @@ class CryptArithm:
             digit, it yields solutions from the next solver.
 
             Args:
-                solver (Callable[[set[int]], Iterator[Solution]]): The next solver.
+                solver (Callable[[Digits], Iterator[Solution]]): The next solver.
 
             Returns:
-                Callable[[set[int]], Iterator[Solution]]: The generated solver.
+                Callable[[Digits], Iterator[Solution]]: The generated solver.
             """
 
-            def solve(used: set[int]) -> Iterator[Solution]:
+            values, slot, allowed, nodes = self._values, self._slot, self._allowed, self._nodes
+
+            def solve(used: Digits) -> Iterator[Solution]:
                 """
                 Solve for a variable by trying each allowable digit.
 
@@ -74,15 +125,19 @@ class CryptArithm:
                 next solver.
 
                 Args:
-                    used (set[int]): Digits currently in use.
+                    used (Digits): Digits currently in use.
 
                 Yields:
                     Iterator[Solution]: Solutions for the variable.
                 """
-                
-                for digit in self._allowed - used:
-                    self._value = digit
-                    yield from solver(used | {digit})
+
+                nodes[0] += 1
+                free = allowed & ~used
+                while free:
+                    bit = free & -free      # Lowest free digit first
+                    free ^= bit
+                    values[slot] = bit.bit_length() - 1
+                    yield from solver(used | bit)
 
             return solve
 
@@ -96,7 +151,8 @@ class CryptArithm:
 
             value = self._value
             if value is None:
-                value = '{' + ''.join(map(str, self._allowed)) + '}'
+                digits = (d for d in range(self._allowed.bit_length()) if self._allowed >> d & 1)
+                value = '{' + ''.join(map(str, digits)) + '}'
             return f"{self._letter}={value}"
 
         def __repr__(self):
@@ -135,7 +191,47 @@ class CryptArithm:
             self._result = result      # Explanation: Set the result variable for the column.
             self._carry_in = None      # Explanation: Initialize carry-in from a smaller column.
             self._carry_to = None      # Explanation: Initialize carry-out to a larger column.
-            self._carry = 0            # Explanation: Initialize carry value for the column.
+            self._values = solver._values
+            self._slot = len(solver._values)   # Explanation: Slot of the carry value for the column.
+            solver._values.append(0)
+            self._nodes = solver._nodes        # Explanation: Shared count of search nodes visited.
+
+        @property
+        def _carry(self) -> int:
+            """
+            The carry out of the column for the current candidate values.
+            """
+            return self._values[self._slot]
+
+        @_carry.setter
+        def _carry(self, carry: int) -> None:
+            self._values[self._slot] = carry
+
+        @property
+        def _result_slot(self) -> int:
+            """
+            The slot of the result digit, or of the constant 0 when the result
+            word is shorter than the column, so the carry absorbs the sum.
+            """
+            return self._result._slot if self._result else CryptArithm._ZERO_SLOT
+
+        def terms(self, *without: 'CryptArithm.Variable') -> tuple[tuple[int, int], ...]:
+            """
+            Compile the digit sum into (coefficient, slot) pairs.
+
+            The carry-in is a term with coefficient 1, so the digit sum is
+            plain arithmetic over the solver's flat array of values.
+
+            Args:
+                *without (CryptArithm.Variable): Addends to leave out.
+
+            Returns:
+                tuple[tuple[int, int], ...]: The compiled terms.
+            """
+            terms = [(count, var._slot) for var, count in self._addends.items() if count and var not in without]
+            if self._carry_in:
+                terms.append((1, self._carry_in._slot))
+            return tuple(terms)
 
         def add(self, var: 'CryptArithm.Variable') -> None:
             """
@@ -217,33 +313,35 @@ class CryptArithm:
             Returns:
                 Solver: The validation solver function.
             """
-            def validate(used: set[int]) -> Iterator[Solution]:
+            values, base, terms, nodes = self._values, self._base, self.terms(), self._nodes
+            result_slot, carry_slot = self._result_slot, self._slot
+            overflow = self._carry_to is not None
+
+            def validate(used: Digits) -> Iterator[Solution]:
                 """
                 Validate the digit-sum column and yield solutions if valid.
 
                 Args:
-                    used (set[int]): The set of used digits.
+                    used (Digits): The set of used digits.
 
                 Yields:
                     Iterator[Solution]: Solutions generated by the next solver.
                 """
 
+                nodes[0] += 1
                 # Compute the sum of the digit counts multiplied by their values
-                result = sum(count * var._value
-                             for var, count in self._addends.items())
-                # Add the carry-in, if present
-                if self._carry_in:
-                    result += self._carry_in._carry
+                result = 0
+                for count, slot in terms:
+                    result += count * values[slot]
 
                 # Compute the carry and result after division
-                carry, result = result // self._base, result % self._base
-                
+                carry, result = result // base, result % base
+
                 # Check if the result is correct and the carry-out is allowed
-                if (result == self._result._value and
-                        (carry == 0 or self._carry_to)):
-                    self._carry = carry
+                if result == values[result_slot] and (carry == 0 or overflow):
+                    values[carry_slot] = carry
                     yield from solver(used)
-            
+
             return validate
 
         def _solve_for_result(self, solver: Solver) -> Solver:
@@ -256,37 +354,38 @@ class CryptArithm:
             Returns:
                 Solver: The solve function for the result digit.
             """
-                
-            def solve(used: set[int]) -> Iterator[Solution]:
+            values, base, terms, nodes = self._values, self._base, self.terms(), self._nodes
+            result_slot, carry_slot, allowed = self._result._slot, self._slot, self._result._allowed
+            overflow = self._carry_to is not None
+
+            def solve(used: Digits) -> Iterator[Solution]:
                 """
                 Solve for the result digit and yield solutions.
 
                 Args:
-                    used (set[int]): The set of used digits.
+                    used (Digits): The set of used digits.
 
                 Yields:
                     Iterator[Solution]: Solutions generated by the next solver.
                 """
 
+                nodes[0] += 1
                 # Compute the sum of the digit counts multiplied by their values
-                result = sum(count * var._value
-                             for var, count in self._addends.items())
-                # Add the carry-in, if present
-                if self._carry_in:
-                    result += self._carry_in._carry
+                result = 0
+                for count, slot in terms:
+                    result += count * values[slot]
 
                 # Compute the carry and result after division
-                carry, digit = result // self._base, result % self._base
+                carry, digit = result // base, result % base
 
                 # Check if the digit is allowed and the carry-out is allowed
-                allowed = self._result._allowed - used
-                if digit in allowed and (carry == 0 or self._carry_to):
-                    self._result._value = digit
-                    self._carry = carry
-                    yield from solver(used | {digit})
+                if (allowed & ~used) >> digit & 1 and (carry == 0 or overflow):
+                    values[result_slot] = digit
+                    values[carry_slot] = carry
+                    yield from solver(used | 1 << digit)
 
             return solve
-        
+
         def _solve_for_addend(self, addend: 'CryptArithm.Variable'):
             """
             Solve for a non-result digit in the digit-sum column.
@@ -307,33 +406,78 @@ class CryptArithm:
                 Yields:
                     Iterator[Solution]: Solutions generated by the next solver.
                 """
-                def solve(used: set[int]) -> Iterator[Solution]:
-                    # Set the value of the non-result digit to 0
-                    addend._value = 0
-                    # Compute the sum of the digit counts multiplied by their values
-                    result = sum(count * var._value
-                                for var, count in self._addends.items())                    
-                    # Add the carry-in, if present
-                    if self._carry_in:
-                        result += self._carry_in._carry
-
-                    # Get the multiplier for the non-result digit (+/- 1)
-                    multiplier = self._addends[addend]
+                values, base, terms, nodes = self._values, self._base, self.terms(addend), self._nodes
+                result_slot, carry_slot = self._result_slot, self._slot
+                addend_slot, allowed = addend._slot, addend._allowed
+                overflow = self._carry_to is not None
+                # Get the multiplier for the non-result digit (+/- 1)
+                multiplier = self._addends[addend]
+
+                def solve(used: Digits) -> Iterator[Solution]:
+                    nodes[0] += 1
+                    # Compute the sum of the other digit counts multiplied by their values
+                    result = 0
+                    for count, slot in terms:
+                        result += count * values[slot]
+
                     # Use modular arithmetic to compute the unique digit
-                    digit = (self._result._value - result) * multiplier
-                    digit %= self._base
+                    digit = (values[result_slot] - result) * multiplier % base
 
                     # Update the result with the computed digit
                     result += digit * multiplier
                     # Compute the carry after division
-                    carry = result // self._base
+                    carry = result // base
 
                     # Check if the digit is allowed and the carry-out is allowed
-                    allowed = addend._allowed - used
-                    if digit in allowed and (carry == 0 or self._carry_to):
-                        addend._value = digit
-                        self._carry = carry
-                        yield from solver(used | {digit})
+                    if (allowed & ~used) >> digit & 1 and (carry == 0 or overflow):
+                        values[addend_slot] = digit
+                        values[carry_slot] = carry
+                        yield from solver(used | 1 << digit)
+
+                return solve
+            return solver
+
+        def _solve_by_trial(self, unknown: 'CryptArithm.Variable'):
+            """
+            Try every allowed digit for the last unknown and validate the column.
+
+            The sum of the other terms is computed once, so each candidate
+            digit costs one multiply-add, and only digits that satisfy the
+            column go on to the next solver.
+
+            Args:
+                unknown (CryptArithm.Variable): The last unknown digit variable.
+
+            Returns:
+                Solver: The solve function for the unknown digit.
+            """
+            def solver(solver: Solver) -> Solver:
+                values, base, terms, nodes = self._values, self._base, self.terms(unknown), self._nodes
+                slot, carry_slot, allowed = unknown._slot, self._slot, unknown._allowed
+                result_slot = self._result_slot
+                is_result = unknown == self._result
+                multiplier = self._addends[unknown]
+                overflow = self._carry_to is not None
+
+                def solve(used: Digits) -> Iterator[Solution]:
+                    nodes[0] += 1
+                    # Compute the sum of the other digit counts multiplied by their values
+                    partial = 0
+                    for count, other in terms:
+                        partial += count * values[other]
+                    expected = values[result_slot]
+
+                    free = allowed & ~used
+                    while free:
+                        bit = free & -free      # Lowest free digit first
+                        free ^= bit
+                        digit = bit.bit_length() - 1
+                        result = partial + multiplier * digit
+                        carry, result = result // base, result % base
+                        if result == (digit if is_result else expected) and (carry == 0 or overflow):
+                            values[slot] = digit
+                            values[carry_slot] = carry
+                            yield from solver(used | bit)
 
                 return solve
             return solver
@@ -362,7 +506,7 @@ class CryptArithm:
 
     #---------------------------------------------------------------------------
     
-    def __init__(self, puzzle: str, base: int = 10, leading_zeros: bool = False):
+    def __init__(self, puzzle: str, base: int = 10, leading_zeros: bool = False, propagate: bool = True):
         """
         Initialize the CryptArithm object with the given puzzle.
 
@@ -370,10 +514,12 @@ class CryptArithm:
             puzzle (str): The word math puzzle.
             base (int, optional): The number base. Defaults to 10.
             leading_zeros (bool, optional): Whether leading zeros are allowed. Defaults to False.
+            propagate (bool, optional): Whether to narrow digits by propagation before and during the search. Defaults to True.
         """
         self._puzzle = puzzle
         self._base = base
         self._leading_zeros = leading_zeros
+        self._propagate = propagate
 
         
         self._puzzle = puzzle
@@ -388,6 +534,13 @@ class CryptArithm:
         
         # Define the range of digits based on the given base
         self._digits = range(base)
+        # Flat array holding every variable's value and every column's carry,
+        # after a constant 0 that stands in for a missing result digit
+        self._values = [0]
+        # Count of search nodes visited, shared by every solver function
+        self._nodes = [0]
+        # Solver chain built by the first call to solutions(), or False if there is no solution
+        self._solver = None
         # Create variables for each unique letter in the puzzle
         self._variables = self._create_variables(puzzle)
         # Create digit-sum columns based on the puzzle
@@ -493,19 +646,229 @@ class CryptArithm:
         
         return columns
 
-    def _strategize(self):
+    def _weights(self, columns: list[Column]) -> Counter:
+        """
+        Collapse digit-sum columns into one whole-word equation.
+
+        Each variable gets the sum of its place values over the columns,
+        positive as an addend and negative as the result, so the columns
+        balance when the weighted sum of the digits is zero.
+
+        Args:
+            columns (list[Column]): Consecutive columns, smallest first.
+
+        Returns:
+            Counter: The weight of each variable.
+        """
+        weights = Counter()
+        place = 1
+        for column in columns:
+            for var, count in column._addends.items():
+                weights[var] += count * place
+            if column._result:
+                weights[column._result] -= place
+            place *= self._base
+        return weights
+
+    def _narrow_carries(self) -> None:
+        """
+        Narrow digits using the range of carries into each column.
+
+        The carry into the ones-column is 0, and each column's digit sum
+        bounds its carry-out. When the sum cannot wrap the result digit
+        lies in the same range, so a leading result digit with no
+        addends equals the final carry (1 for two addends). Nothing may
+        carry out of the leading column, which bounds its addends.
+        """
+        base = self._base
+        low = high = 0  # Range of the carry into the ones-column
+        for column in self._columns:
+            addends = [(var, count, *var.bounds) for var, count in column._addends.items() if count]
+            total_low = low + sum(count * small for _, count, small, _ in addends)
+            total_high = high + sum(count * large for _, count, _, large in addends)
+
+            if column._carry_to is None:
+                for var, count, small, _ in addends:
+                    var.restrict(0, (base - 1 - total_low + count * small) // count)
+                total_high = min(total_high, base - 1)
+
+            # The sum does not wrap, so the result digit is the sum less a fixed carry
+            if column._result and total_low // base == total_high // base:
+                column._result.restrict(total_low % base, total_high % base)
+
+            low, high = total_low // base, total_high // base
+
+    def _narrow_words(self, weights: Counter) -> None:
+        """
+        Narrow digits by bounds consistency on the whole-word equation.
+
+        Each variable's weighted digit must cancel what the others can
+        add up to, given their smallest and largest allowed digits.
+
+        Args:
+            weights (Counter): The weight of each variable, from _weights.
+        """
+        ranges = {}
+        for var, weight in weights.items():
+            small, large = var.bounds
+            ranges[var] = (weight * small, weight * large) if weight > 0 else (weight * large, weight * small)
+        total_low = sum(low for low, _ in ranges.values())
+        total_high = sum(high for _, high in ranges.values())
+
+        for var, weight in weights.items():
+            if not weight:
+                continue
+            rest_low, rest_high = total_low - ranges[var][0], total_high - ranges[var][1]
+            # weight * digit must lie in [-rest_high, -rest_low]
+            if weight > 0:
+                var.restrict(-(rest_high // weight), -rest_low // weight)
+            else:
+                var.restrict(-(-rest_low // -weight), rest_high // -weight)
+
+    def _narrow(self) -> bool:
+        """
+        Narrow the allowed digits of every variable before the search.
+
+        Carry bounds, whole-word bounds and distinct digits (a digit
+        forced on one letter is removed from the others) are applied in
+        turn until nothing changes.
+
+        Returns:
+            bool: False if some variable has no digits left, so there is no solution.
+        """
+        variables = list(self._variables.values())
+        weights = self._weights(self._columns)
+        while True:
+            before = [var._allowed for var in variables]
+            self._narrow_carries()
+            self._narrow_words(weights)
+            for var in variables:
+                if var._allowed and var._allowed & var._allowed - 1 == 0:
+                    for other in variables:
+                        if other is not var:
+                            other._allowed &= ~var._allowed
+
+            after = [var._allowed for var in variables]
+            if not all(after):
+                return False
+            if after == before:
+                return True
+
+    def _order(self, column: Column, unknowns: list[Variable]) -> list[Variable]:
+        """
+        Order a column's unknowns by the size of their domains.
+
+        Variables with the fewest allowed digits are tried first, so the
+        search branches late. The last place goes to a variable the
+        column can solve for directly, preferring the largest domain,
+        since that one is computed rather than tried.
+
+        Args:
+            column (Column): The column being solved.
+            unknowns (list[Variable]): Its unknowns, in decreasing usage.
+
+        Returns:
+            list[Variable]: The unknowns in search order.
+        """
+        unknowns = sorted(unknowns, key=lambda var: bin(var._allowed).count("1"))
+        direct = [var for var in unknowns if column.solver(var)]
+        if direct:
+            unknowns.remove(direct[-1])
+            unknowns.append(direct[-1])
+        return unknowns
+
+    def _bounds_check(self, index: int, knowns: set[Variable]):
+        """
+        Prune partial solutions whose remaining columns cannot balance.
+
+        Once the columns up to `index` are solved, the columns above
+        must balance the carry out of `index` using the digits still
+        free. The known digits and the carry are summed exactly; each
+        unknown adds the range of its weight times its free digits.
+
+        Args:
+            index (int): The last column solved.
+            knowns (set[Variable]): Variables already known at that point.
+
+        Returns:
+            Solver: The strategy function for the check.
+        """
+        weights = self._weights(self._columns[index + 1:])
+        fixed = [(weight, var._slot) for var, weight in weights.items() if weight and var in knowns]
+        fixed.append((1, self._columns[index]._slot))
+        free_terms = tuple((weight, var._allowed) for var, weight in weights.items() if weight and var not in knowns)
+        fixed = tuple(fixed)
+        values = self._values
+
+        def strategy(solver: Solver) -> Solver:
+            def check(used: Digits) -> Iterator[Solution]:
+                low = 0
+                for weight, slot in fixed:
+                    low += weight * values[slot]
+                high = low
+                for weight, allowed in free_terms:
+                    free = allowed & ~used
+                    if not free:
+                        return
+                    small, large = (free & -free).bit_length() - 1, free.bit_length() - 1
+                    if weight > 0:
+                        low += weight * small
+                        high += weight * large
+                    else:
+                        low += weight * large
+                        high += weight * small
+                if low <= 0 <= high:
+                    yield from solver(used)
+            return check
+        return strategy
+
+    def _stopper(self, stop: Callable[[], bool]):
+        """
+        Abandon the search once `stop` returns True.
+
+        `stop` is only called every 256 visits, since it may be a
+        cross-process flag that is slow to read.
+
+        Args:
+            stop (Callable[[], bool]): Returns True when the search should end.
+
+        Returns:
+            Solver: The strategy function for the check.
+        """
+        visits = [0]
+
+        def strategy(solver: Solver) -> Solver:
+            def check(used: Digits) -> Iterator[Solution]:
+                visits[0] += 1
+                if visits[0] & 255 == 0 and stop():
+                    return
+                yield from solver(used)
+            return check
+        return strategy
+
+    def _strategize(self, stop: Optional[Callable[[], bool]] = None):
         """
         Determine a solving strategy.
 
-        Returns a list of strategy functions.
+        Returns a list of strategy functions. Each one is compiled once
+        into (coefficient, slot) terms over the flat array of values, so
+        the search itself only does integer arithmetic on list entries.
+
+        With propagation, unknowns are ordered by domain size and each
+        column with unknowns above it is followed by a bounds check.
+        With `stop`, each column is followed by a check of it. The
+        variables are recorded in the order the search assigns them.
         """
 
         strategies = []
         knowns = set()
+        self._search_order = []
         
         # For each column, starting at the ones-column...
-        for column in self._columns:
+        for index, column in enumerate(self._columns):
             unknowns = column.unknowns(knowns)
+            if self._propagate:
+                unknowns = self._order(column, unknowns)
             if TRACE:
                 print(f"{column}: {unknowns}")
 
@@ -521,45 +884,159 @@ class CryptArithm:
                 if solver:
                     strategies.append(solver)
                 else:
-                    # Failing that, try every possible value...
-                    strategies.append(last.solver)
-                    # ... and validate the column
-                    strategies.append(column.validator)
+                    # Failing that, try every possible value and validate
+                    # the column in the same step
+                    strategies.append(column._solve_by_trial(last))
 
                 knowns |= set(unknowns)
+                self._search_order.extend(unknowns)
+                if self._propagate and index + 1 < len(self._columns):
+                    strategies.append(self._bounds_check(index, knowns))
             else:
                 # No unknowns! Just validate the column
                 strategies.append(column.validator)
 
+            if stop:
+                strategies.append(self._stopper(stop))
+
         return strategies
 
-    def solutions(self) -> Iterator[Solution]:
+    def solutions(self, stop: Optional[Callable[[], bool]] = None) -> Iterator[Solution]:
         """
         Create a solver strategy, and then generate all possible
         solutions.
+
+        Args:
+            stop (Callable[[], bool], optional): Polled during the search, which ends early once it returns True.
         """
         
-        strategies = self._strategize()
+        self._nodes[0] = 0
+        solver = self._solver if stop is None else None
+        if solver is None:
+            solver = self._compile(stop)
+            if stop is None:
+                self._solver = solver
+        if solver:
+            yield from solver(0)
+
+    def _compile(self, stop: Optional[Callable[[], bool]] = None):
+        """
+        Chain the strategy functions into one solver.
+
+        Returns:
+            Solver: The solver for the whole puzzle, or False if propagation
+            shows there is no solution.
+        """
+        if self._propagate and not self._narrow():
+            return False
+
+        strategies = self._strategize(stop)
         solver = self._emitter()
         for strategy in reversed(strategies):
             solver = strategy(solver)
+        return solver
+
+    @property
+    def nodes(self) -> int:
+        """
+        The number of search nodes visited so far by solutions().
+        """
+        return self._nodes[0]
+
+    def _subproblems(self, depth: int) -> tuple[list[str], list[tuple[int, ...]]]:
+        """
+        Split the search on the first `depth` variables it assigns.
 
-        yield from solver(set())
+        Args:
+            depth (int): How many variables to split on.
 
-    def solve(self) -> Solution:
+        Returns:
+            tuple[list[str], list[tuple[int, ...]]]: The letters split on, and
+            every combination of distinct allowed digits for them.
+        """
+        if self._propagate and not self._narrow():
+            return [], []
+        self._strategize()
+        split = self._search_order[:depth]
+        digits = [[d for d in self._digits if var._allowed >> d & 1] for var in split]
+        combinations = [combo for combo in product(*digits) if len(set(combo)) == len(combo)]
+        return [var._letter for var in split], combinations
+
+    def parallel_solutions(self, workers: Optional[int] = None, depth: int = 1, first: bool = False) -> Iterator[Solution]:
+        """
+        Generate all solutions, searching subtrees on a pool of processes.
+
+        The search is split on every combination of digits for the first
+        `depth` variables it assigns. Each worker parses the puzzle again,
+        fixes those letters and searches the rest. Solutions arrive in
+        the order the subtrees finish, not in the order of solutions().
+        Afterwards `nodes` holds the total over all workers.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+            depth (int, optional): Number of variables to split on, 1 or 2. Defaults to 1.
+            first (bool, optional): Stop every worker once a solution is found, and yield only that one. Defaults to False.
+
+        Yields:
+            Solution: Each solution found.
+
+        Raises:
+            ValueError: If depth is not 1 or 2, or workers is less than 1.
+        """
+        if depth not in (1, 2):
+            raise ValueError("Error: The split depth should be 1 or 2.")
+        if workers is not None and workers < 1:
+            raise ValueError("Error: The number of workers should be at least 1.")
+
+        letters, combinations = self._subproblems(depth)
+        self._nodes[0] = 0
+        if not combinations:
+            return
+
+        stop = multiprocessing.Event()
+        args = (self._puzzle, self._base, self._leading_zeros, self._propagate)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(stop,)) as executor:
+            futures = [executor.submit(_solve_subtree, *args, dict(zip(letters, combo)), first) for combo in combinations]
+            try:
+                for future in as_completed(futures):
+                    solutions, nodes = future.result()
+                    self._nodes[0] += nodes
+                    if first and solutions:
+                        yield solutions[0]
+                        return
+                    yield from solutions
+            finally:
+                # Ends running subtrees early and drops the queued ones
+                stop.set()
+                for future in futures:
+                    future.cancel()
+
+    def solve(self, workers: int = 1) -> Solution:
         """
         Find the unique solution to the puzzle.
+
+        Args:
+            workers (int, optional): Number of worker processes; more than one searches in parallel. Defaults to 1.
+
+        Returns:
+            Solution: The first solution found.
         """
-        solution = next(solutions, None)
+        if workers > 1:
+            solution = next(self.parallel_solutions(workers, first=True), None)
+        else:
+            solution = next(self.solutions(), None)
 
         if solution is None:
             raise ValueError("No solution found")
 
-        
+        return solution
 
     def _emitter(self) -> Solver:
-        def solver(used: set[int]) -> Iterator[Solution]:
-            yield {var._letter: var._value for var in self._variables.values()}
+        values = self._values
+        slots = [(var._letter, var._slot) for var in self._variables.values()]
+
+        def solver(used: Digits) -> Iterator[Solution]:
+            yield {letter: values[slot] for letter, slot in slots}
         return solver
 
     def substitute(self, solution: dict[str, int]) -> str:
@@ -578,7 +1055,214 @@ class CryptArithm:
 
 #===============================================================================
 
+# Set in each worker process of parallel_solutions, to end the search early
+_STOP = None
+
+
+def _init_worker(stop) -> None:
+    global _STOP
+    _STOP = stop
+
+
+def _solve_subtree(puzzle: str, base: int, leading_zeros: bool, propagate: bool,
+                   fixed: dict[str, int], first: bool) -> tuple[list[Solution], int]:
+    """
+    Search the subtree where some letters have fixed digits.
+
+    Args:
+        puzzle (str): The word math puzzle.
+        base (int): The number base.
+        leading_zeros (bool): Whether leading zeros are allowed.
+        propagate (bool): Whether to use constraint propagation.
+        fixed (dict[str, int]): The digit of each letter split on.
+        first (bool): Stop at the first solution.
+
+    Returns:
+        tuple[list[Solution], int]: The solutions found and the nodes visited.
+    """
+    ca = CryptArithm(puzzle, base, leading_zeros, propagate)
+    for letter, digit in fixed.items():
+        ca._variables[letter]._allowed &= 1 << digit
+
+    solutions = []
+    for solution in ca.solutions(_STOP.is_set):
+        solutions.append(solution)
+        if first:
+            break
+    return solutions, ca.nodes
+
+#===============================================================================
+
+# Labels for the letters of canonical puzzles, in order of first appearance
+LABELS = string.ascii_uppercase + string.ascii_lowercase
+
+
+def canonical(puzzle: str) -> tuple[str, dict[str, str]]:
+    """
+    Rename the letters of a puzzle in order of first appearance.
+
+    Puzzles that differ only in their letters, such as TO+TO=FOR and
+    GO+GO=POT, have the same canonical form (AB+AB=CBD) and so the same
+    columns and solutions up to the letters.
+
+    Args:
+        puzzle (str): The word math puzzle.
+
+    Returns:
+        tuple[str, dict[str, str]]: The canonical puzzle, with whitespace
+        removed, and the original letter for each label.
+    """
+    equation = re.sub('=+', '=', re.sub(r'\s+', '', puzzle))
+    labels = {}
+    for ch in equation:
+        if ch.isalpha() and ch not in labels:
+            if len(labels) == len(LABELS):
+                raise ValueError("Puzzle has too many unique digits. Maximum allowed is 10.")
+            labels[ch] = LABELS[len(labels)]
+    shape = ''.join(labels.get(ch, ch) for ch in equation)
+    return shape, {label: letter for letter, label in labels.items()}
+
+
+# Compiled puzzles of this process, by (canonical puzzle, base, leading_zeros), least recently used first
+_COMPILED = OrderedDict()
+_CACHE_SIZE = 128
+
+
+def _init_batch(cache_size: int) -> None:
+    global _CACHE_SIZE
+    _CACHE_SIZE = cache_size
+    _COMPILED.clear()
+
+
+def _solve_one(puzzle: str, base: int, leading_zeros: bool) -> dict:
+    """
+    Solve one puzzle of a batch, through the cache of compiled puzzles.
+
+    Returns:
+        dict: The puzzle with its solutions, the search nodes visited and
+        whether the compiled puzzle was cached, or with an error message.
+    """
+    key = None
+    try:
+        shape, letters = canonical(puzzle)
+        key = (shape, base, leading_zeros)
+        ca = _COMPILED.get(key)
+        cached = ca is not None
+        if cached:
+            _COMPILED.move_to_end(key)
+        else:
+            ca = CryptArithm(shape, base, leading_zeros)
+            _COMPILED[key] = ca
+            if len(_COMPILED) > _CACHE_SIZE:
+                _COMPILED.popitem(last=False)
+        solutions = [{letters[label]: digit for label, digit in solution.items()} for solution in ca.solutions()]
+    except (ValueError, NotImplementedError, RuntimeError) as e:
+        return {"puzzle": puzzle, "error": str(e)}
+    except Exception as e:
+        # Any other failure is reported for this puzzle alone, and its
+        # compiled solver is dropped in case it was left half built
+        _COMPILED.pop(key, None)
+        return {"puzzle": puzzle, "error": f"{type(e).__name__}: {e}"}
+    return {"puzzle": puzzle, "solutions": solutions, "nodes": ca.nodes, "cached": cached}
+
+
+def _solve_chunk(puzzles: list[str], base: int, leading_zeros: bool) -> list[dict]:
+    return [_solve_one(puzzle, base, leading_zeros) for puzzle in puzzles]
+
+
+def solve_batch(puzzles: Iterable[str], workers: Optional[int] = None, cache_size: int = 128,
+                base: int = 10, leading_zeros: bool = False, chunk: int = 64) -> Iterator[dict]:
+    """
+    Solve a stream of puzzles on a pool of processes.
+
+    Puzzles are sent to the workers in chunks, with a bounded number of
+    chunks in flight, so the input is read as the results are consumed.
+    Each worker keeps the compiled solvers of the last `cache_size`
+    canonical puzzles, so puzzles that differ only in their letters are
+    parsed and compiled once per worker.
+
+    Args:
+        puzzles (Iterable[str]): The puzzles to solve.
+        workers (int, optional): Number of worker processes, 1 to solve in this process. Defaults to the number of CPUs.
+        cache_size (int, optional): Compiled puzzles kept per worker. Defaults to 128.
+        base (int, optional): The number base. Defaults to 10.
+        leading_zeros (bool, optional): Whether leading zeros are allowed. Defaults to False.
+        chunk (int, optional): Puzzles per task sent to a worker. Defaults to 64.
+
+    Yields:
+        dict: The result of each puzzle, in input order, as from _solve_one.
+
+    Raises:
+        ValueError: If workers is less than 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("Error: The number of workers should be at least 1.")
+
+    puzzles = iter(puzzles)
+    chunks = iter(lambda: list(islice(puzzles, chunk)), [])
+
+    if workers == 1:
+        _init_batch(cache_size)
+        for batch in chunks:
+            yield from _solve_chunk(batch, base, leading_zeros)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_batch, initargs=(cache_size,)) as executor:
+        pending = deque()
+        for batch in chunks:
+            pending.append(executor.submit(_solve_chunk, batch, base, leading_zeros))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def solve_stream(source: TextIO, output: TextIO, **options) -> int:
+    """
+    Solve the puzzles in a text stream, one per line, writing JSON lines.
+
+    Blank lines are skipped. Each output line is the JSON of one result
+    from solve_batch, in input order.
+
+    Args:
+        source (TextIO): Puzzles, one per line.
+        output (TextIO): Where the JSON lines are written.
+        **options: Passed on to solve_batch.
+
+    Returns:
+        int: The number of puzzles solved.
+    """
+    puzzles = (line.strip() for line in source if line.strip())
+    count = 0
+    for result in solve_batch(puzzles, **options):
+        output.write(json.dumps(result) + '\n')
+        count += 1
+    return count
+
+#===============================================================================
+
 if __name__ == '__main__':
+    # With arguments, solve a file of puzzles in batch instead of prompting
+    if len(sys.argv) > 1:
+        parser = argparse.ArgumentParser(description="Solve word math puzzles in batch, one per line, printing JSON lines.")
+        parser.add_argument("batch", help="file of puzzles, or - for standard input")
+        parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+        parser.add_argument("-c", "--cache", type=int, default=128, help="compiled puzzles cached per worker (default: 128)")
+        parser.add_argument("-b", "--base", type=int, default=10, help="number base (default: 10)")
+        parser.add_argument("-z", "--leading-zeros", action="store_true", help="allow leading zeros")
+        args = parser.parse_args()
+
+        source = sys.stdin if args.batch == '-' else open(args.batch)
+        with source:
+            try:
+                solve_stream(source, sys.stdout, workers=args.workers, cache_size=args.cache,
+                             base=args.base, leading_zeros=args.leading_zeros)
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                sys.exit(1)
+        sys.exit(0)
+
     # Prompt user for input formats and puzzles
     print("Enter word math puzzles Multiline is allowed. (press Enter twice after each puzzle and thrice after last puzzle has been entered):")
     print("Note that upper and lower case characters are perceived as distinct digits and leading zeros are acceptable")
@@ -614,6 +1298,9 @@ if __name__ == '__main__':
         except (ValueError, NotImplementedError, RuntimeError) as e:
             print(f"Error in puzzle format: {e}")
             continue
+        except Exception as e:
+            print(f"Error: {type(e).__name__}: {e}")
+            continue
 
         unique_variables = len(ca._variables)
         if unique_variables > 10:
@@ -633,5 +1320,8 @@ if __name__ == '__main__':
 
             if solution_count == 0:
                 print("No solution found")
+            print(f"Nodes visited: {ca.nodes}")
         except ValueError as e:
-            print(f"{str(e)}")  # Print the custom message for no solution found
\ No newline at end of file
+            print(f"{str(e)}")  # Print the custom message for no solution found
+        except Exception as e:
+            print(f"Error: {type(e).__name__}: {e}")  # One failing puzzle does not stop the rest
\ No newline at end of file
@@ -0,0 +1,124 @@
+import random
+import re
+from itertools import permutations
+
+import pytest
+
+from bench_task1 import legacy_solutions
+from task1 import CryptArithm, solve_batch
+
+
+def random_puzzle(rng, letters=8):
+    """
+    Build a puzzle with at least one solution by spelling out a true sum.
+    """
+    digits = rng.sample(range(10), letters)
+    spell = dict(zip(digits, rng.sample("ABCDEFGHIJKLMNOPQRSTUVWXYZ", letters)))
+    while True:
+        addends = []
+        for _ in range(rng.randint(2, 3)):
+            length = rng.randint(1, 4)
+            first = rng.choice([d for d in digits if d])
+            addends.append(int(str(first) + ''.join(str(rng.choice(digits)) for _ in range(length - 1))))
+        total = str(sum(addends))
+        if all(int(d) in spell for d in total):
+            words = [''.join(spell[int(d)] for d in str(number)) for number in addends + [int(total)]]
+            return '+'.join(words[:-1]) + '=' + words[-1]
+
+
+def solution_set(solutions):
+    return {frozenset(solution.items()) for solution in solutions}
+
+
+def brute_force(puzzle, base=10, leading_zeros=False):
+    """
+    Try every assignment of distinct digits to the letters.
+    """
+    words = re.findall(r"[A-Za-z]+", puzzle)
+    letters = sorted(set(''.join(words)))
+    solutions = set()
+    for digits in permutations(range(base), len(letters)):
+        value = dict(zip(letters, digits))
+        if not leading_zeros and any(len(word) > 1 and value[word[0]] == 0 for word in words):
+            continue
+        numbers = [sum(value[letter] * base ** place for place, letter in enumerate(reversed(word))) for word in words]
+        if sum(numbers[:-1]) == numbers[-1]:
+            solutions.add(frozenset(value.items()))
+    return solutions
+
+
+def test_propagation_matches_legacy_solver():
+    rng = random.Random(23)
+    for _ in range(200):
+        puzzle = random_puzzle(rng, rng.randint(3, 9))
+        expected = solution_set(legacy_solutions(puzzle))
+        assert expected, puzzle                                                 # Every generated puzzle has a solution
+        assert solution_set(CryptArithm(puzzle).solutions()) == expected, puzzle
+
+
+def test_solve_batch_matches_single_solver():
+    puzzles = ["SEND+MORE=MONEY", "TO+GO=OUT", "AB+AB=C"]
+    results = list(solve_batch(puzzles, workers=1))
+    assert [result["puzzle"] for result in results] == puzzles
+    for puzzle, result in zip(puzzles, results):
+        assert solution_set(result["solutions"]) == solution_set(CryptArithm(puzzle).solutions())
+
+
+def test_solve_batch_rejects_bad_worker_counts(monkeypatch):
+    with pytest.raises(ValueError, match="^Error:"):
+        list(solve_batch(["SEND+MORE=MONEY"], workers=0))
+    monkeypatch.setattr("task1.os.cpu_count", lambda: None)                     # Unknown CPU count falls back to one worker
+    assert len(list(solve_batch(["TO+GO=OUT"] * 3, chunk=1))) == 3
+
+
+@pytest.mark.parametrize("options", [{"depth": 0}, {"depth": 3}, {"workers": 0}])
+def test_parallel_solutions_rejects_bad_options(options):
+    with pytest.raises(ValueError, match="^Error:"):
+        next(CryptArithm("SEND+MORE=MONEY").parallel_solutions(**options))
+
+
+def test_parallel_solutions_match_serial_search():
+    puzzle = "SEND+MORE=MONEY"
+    expected = solution_set(CryptArithm(puzzle).solutions())
+    for depth in (1, 2):
+        assert solution_set(CryptArithm(puzzle).parallel_solutions(workers=2, depth=depth)) == expected
+
+
+@pytest.mark.parametrize("puzzle, count", [
+    ("G+F+GFG+G=FF", 9),
+    ("FEF+B=EB", 72),
+    ("IDCI+C+C=CDD", 0),
+    ("CBHF+CFH+CC=BIC", 0),
+])
+@pytest.mark.parametrize("propagate", (True, False))
+def test_result_shorter_than_an_addend(puzzle, count, propagate):
+    solutions = solution_set(CryptArithm(puzzle, leading_zeros=True, propagate=propagate).solutions())
+    assert len(solutions) == count
+    assert solutions == brute_force(puzzle, leading_zeros=True)
+
+
+@pytest.mark.parametrize("base", (6, 8, 10))
+def test_random_short_results_match_brute_force(base):
+    rng = random.Random(base)
+    for _ in range(40):
+        letters = rng.sample("ABCDEFG", rng.randint(2, min(base, 5)))
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(3, 4))]
+        puzzle = '+'.join(words[:-1]) + '=' + words[-1]
+        for propagate in (True, False):
+            solutions = CryptArithm(puzzle, base, leading_zeros=True, propagate=propagate).solutions()
+            assert solution_set(solutions) == brute_force(puzzle, base, leading_zeros=True), puzzle
+
+
+def test_solve_batch_reports_unexpected_errors_per_puzzle(monkeypatch):
+    solutions = CryptArithm.solutions
+
+    def failing(self, *args, **kwargs):
+        if len(self._variables) == 4:
+            raise KeyError("broken")
+        return solutions(self, *args, **kwargs)
+
+    monkeypatch.setattr(CryptArithm, "solutions", failing)
+    results = list(solve_batch(["SEND+MORE=MONEY", "TO+GO=OUT", "TO+GO=OUT", "AB+AB=C"], workers=1))
+    assert [result.get("error") for result in results] == [None, "KeyError: 'broken'", "KeyError: 'broken'", None]
+    assert not results[2].get("cached")                                         # The failed solver was not kept
+    assert results[0]["solutions"] and "solutions" in results[3]
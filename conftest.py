@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Every assignment keeps its modules at the top of its own directory, and
+# several share names (task1, bench_task1), so the modules of the
+# assignment under test are swapped into sys.modules before its tests are
+# imported or run.
+_LOADED = {}
+
+
+def _activate(directory):
+    directory = Path(directory).resolve()
+    names = {path.stem for path in directory.glob("*.py") if not path.stem.startswith(("test_", "conftest"))}
+    for name in names:
+        module = sys.modules.get(name)
+        origin = getattr(module, "__file__", None)
+        if origin and Path(origin).resolve().parent != directory:
+            _LOADED[Path(origin).resolve().parent, name] = sys.modules.pop(name)
+        if name not in sys.modules and (directory, name) in _LOADED:
+            sys.modules[name] = _LOADED[directory, name]
+    if str(directory) in sys.path:
+        sys.path.remove(str(directory))
+    sys.path.insert(0, str(directory))
+
+
+def pytest_pycollect_makemodule(module_path, parent):
+    _activate(module_path.parent)
+
+
+@pytest.fixture(autouse=True)
+def _assignment_modules(request):
+    _activate(request.path.parent)